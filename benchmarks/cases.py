@@ -0,0 +1,78 @@
+"""Inputs for the SentenceSplitter benchmarks.
+
+Real LLM token traces from tests/test_data, where each record is the token
+text followed by "!@#" and the time in seconds it arrived at, plus synthetic
+streams that stress long buffers and ambiguous boundaries.
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+TRACE_DIRECTORY = REPO_ROOT / "tests" / "test_data"
+
+
+def load_trace(path: Path) -> list[tuple[str, float]]:
+    """
+    Returns the (token, seconds) records of a trace file. A token may span
+    several lines; its record ends at the line holding the separator.
+    """
+    records = []
+    token = ""
+    with open(path, encoding="utf-8") as file:
+        for line in file:
+            if "!@#" in line:
+                text, seconds = line.split("!@#", 1)
+                records.append((token + text, float(seconds)))
+                token = ""
+            else:
+                token += line
+    if token:
+        records.append((token, records[-1][1] if records else 0.0))
+    return records
+
+
+def trace_cases() -> dict[str, list[str]]:
+    return {
+        f"trace-{path.stem}": [token for token, _ in load_trace(path)]
+        for path in sorted(TRACE_DIRECTORY.glob("*.txt"))
+    }
+
+
+def _characters(text: str) -> list[str]:
+    return list(text)
+
+
+def synthetic_cases(scale: int = 1) -> dict[str, list[str]]:
+    """
+    Returns character streams for cases the traces do not cover. scale
+    multiplies their length.
+    """
+    return {
+        # No sentence ever ends, so every character lands in a growing buffer
+        "long-buffer": _characters(
+            " ".join(f"word{index % 97}, and more" for index in range(600 * scale))
+        ),
+        # Periods that are mostly not sentence boundaries
+        "abbreviations": _characters(
+            "Dr. A. B. Smith, Ph.D., met Mr. J. R. R. Tolkien at 3 p.m. on Jan. 5, "
+            "e.g. in the U.S. near St. Louis, Mo. Prof. Lee et al. agreed. " * 40 * scale
+        ),
+        # Numbers, versions and URLs full of delimiters
+        "numbers-urls": _characters(
+            "Pi is 3.14159 and v2.0.1 ships today. See https://example.com/a?b=1&c=2. "
+            "It costs $4.99, i.e. 4.99 USD! Really? Yes: 10:30 a.m. sharp. " * 40 * scale
+        ),
+        # One huge token without whitespace, like minified JSON
+        "no-whitespace": _characters('{"a":1.5,"b":[1,2,3],"c":"x.y?z!"},' * 150 * scale),
+        # Many sentences shorter than the minimum sentence length
+        "short-sentences": _characters("Hi. Ok. Yes! No? Sure. Fine. " * 150 * scale),
+    }
+
+
+def all_cases(scale: int = 1) -> dict[str, list[str]]:
+    cases = trace_cases()
+    cases.update(synthetic_cases(scale))
+    return cases
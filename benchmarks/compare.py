@@ -0,0 +1,61 @@
+"""Compare two result files written by run_benchmarks.py.
+
+Prints the throughput and p99 latency change of every benchmark present in
+both files, and flags benchmarks whose output changed. Exits with status 1 if
+any throughput dropped by more than --threshold, or any output changed.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+
+def load_results(path: Path) -> dict:
+    report = json.loads(path.read_text(encoding="utf-8"))
+    return {
+        (result["tokenizer"], result["config"], result["case"]): result
+        for result in report["results"]
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("before", type=Path)
+    parser.add_argument("after", type=Path)
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.10,
+        help="Largest tolerated relative throughput drop (default: 0.10).",
+    )
+    args = parser.parse_args()
+
+    before = load_results(args.before)
+    after = load_results(args.after)
+
+    failed = False
+    for key in sorted(before.keys() & after.keys()):
+        old, new = before[key], after[key]
+        speedup = new["chars_per_sec"] / old["chars_per_sec"]
+        p99 = new["step_us_p99"] / old["step_us_p99"] if old["step_us_p99"] else float("nan")
+        notes = []
+        if speedup < 1 - args.threshold:
+            notes.append("SLOWER")
+            failed = True
+        if new["output_sha1"] != old["output_sha1"]:
+            notes.append("OUTPUT CHANGED")
+            failed = True
+        print(
+            f"{' '.join(key):50} throughput x{speedup:5.2f}  p99 x{p99:5.2f}  {' '.join(notes)}"
+        )
+
+    for key in sorted(before.keys() ^ after.keys()):
+        print(f"{' '.join(key):50} only in {'before' if key in before else 'after'}")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""Measure how long `import stream2sentence` takes in a fresh interpreter.
+
+Each run starts a new Python process with -X importtime and reads the
+cumulative import time of the package. The best run is compared against a
+budget, and the script exits with status 1 if it is over the budget or if
+importing the package loaded one of the modules that are only needed by
+optional features.
+"""
+
+from __future__ import annotations
+
+import argparse
+import subprocess
+import sys
+from pathlib import Path
+
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+
+# Loaded on first use of the nltk/stanza tokenizers, split_many(),
+# generate_sentences() and the time based strategy respectively.
+LAZY_MODULES = (
+    "nltk",
+    "stanza",
+    "multiprocessing",
+    "inspect",
+    "stream2sentence.stream2sentence_time_based",
+)
+
+
+def import_time_us(module: str) -> int:
+    """Returns the cumulative import time of module in microseconds."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        check=True,
+        cwd=REPO_ROOT,
+        text=True,
+    )
+    for line in result.stderr.splitlines():
+        _, _, cumulative, name = (part.strip() for part in line.replace(":", "|", 1).split("|"))
+        if name == module:
+            return int(cumulative)
+    raise RuntimeError(f"{module} was not imported:\n{result.stderr}")
+
+
+def eagerly_imported(module: str, candidates=LAZY_MODULES) -> list[str]:
+    """Returns the candidates that importing module loads right away."""
+    script = (
+        "import sys\n"
+        f"import {module}\n"
+        f"print('\\n'.join(name for name in {list(candidates)!r} if name in sys.modules))\n"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", script],
+        capture_output=True,
+        check=True,
+        cwd=REPO_ROOT,
+        text=True,
+    )
+    return result.stdout.split()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=7, help="Fresh interpreters to start.")
+    parser.add_argument(
+        "--budget-ms",
+        type=float,
+        default=60.0,
+        help="Fail if the best import time is above this many milliseconds.",
+    )
+    args = parser.parse_args()
+
+    times = sorted(import_time_us("stream2sentence") for _ in range(args.runs))
+    best_ms = times[0] / 1000
+    median_ms = times[len(times) // 2] / 1000
+    print(f"import stream2sentence: best {best_ms:.1f} ms, median {median_ms:.1f} ms")
+
+    failed = False
+    eager = eagerly_imported("stream2sentence")
+    if eager:
+        print(f"imported eagerly: {', '.join(eager)}")
+        failed = True
+    if best_ms > args.budget_ms:
+        print(f"over the budget of {args.budget_ms:.1f} ms")
+        failed = True
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+"""Replay token traces through the time based strategy in virtual time.
+
+Every trace is replayed with every combination of the given target_tps and
+lead_time values, without waiting for the recorded token times, and each
+combination is scored by how it would sound read aloud at --speech-wps
+words per second:
+
+    python benchmarks/replay_time_based.py --target-tps 3 3.6 4 --lead-time 0.3 1
+
+first_s is the mean time to the first output, silence_s the mean time per
+trace during which the previous output had been spoken and the next one had
+not been yielded yet.
+"""
+
+from __future__ import annotations
+
+import argparse
+import itertools
+import json
+import sys
+import time
+from pathlib import Path
+
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(REPO_ROOT))
+
+from stream2sentence.stream2sentence_time_based import replay_time_based  # noqa: E402
+
+from cases import TRACE_DIRECTORY, load_trace  # noqa: E402
+
+
+def trace_paths(paths: list[Path]) -> list[Path]:
+    found = []
+    for path in paths:
+        found.extend(sorted(path.glob("*.txt")) if path.is_dir() else [path])
+    return found
+
+
+def score(outputs: list[tuple[float, str]], speech_wps: float) -> dict:
+    """Returns the time to the first output and the silence between outputs."""
+    silence = 0.0
+    spoken_until = None
+    for seconds, output in outputs:
+        if spoken_until is not None and seconds > spoken_until:
+            silence += seconds - spoken_until
+        start = seconds if spoken_until is None else max(seconds, spoken_until)
+        spoken_until = start + len(output.split()) / speech_wps
+    return {
+        "first_s": outputs[0][0] if outputs else None,
+        "silence_s": silence,
+        "outputs": len(outputs),
+    }
+
+
+def mean(values):
+    values = [value for value in values if value is not None]
+    return sum(values) / len(values) if values else None
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "traces",
+        nargs="*",
+        type=Path,
+        default=[TRACE_DIRECTORY],
+        help="Trace files or directories of them (default: tests/test_data).",
+    )
+    parser.add_argument("--target-tps", nargs="+", type=float, default=[4.0])
+    parser.add_argument("--lead-time", nargs="+", type=float, default=[1.0])
+    parser.add_argument("--speech-wps", type=float, default=3.0, help="Words spoken per second.")
+    parser.add_argument(
+        "--schedule-deadlines",
+        action="store_true",
+        help="Yield output that becomes due between two tokens at its deadline.",
+    )
+    parser.add_argument("--output", type=Path, help="Write the JSON results to this file.")
+    args = parser.parse_args()
+
+    traces = [load_trace(path) for path in trace_paths(args.traces)]
+    results = []
+    for target_tps, lead_time in itertools.product(args.target_tps, args.lead_time):
+        start = time.perf_counter()
+        scores = [
+            score(
+                replay_time_based(
+                    records,
+                    schedule_deadlines=args.schedule_deadlines,
+                    target_tps=target_tps,
+                    lead_time=lead_time,
+                ),
+                args.speech_wps,
+            )
+            for records in traces
+        ]
+        result = {
+            "target_tps": target_tps,
+            "lead_time": lead_time,
+            "traces": len(traces),
+            "first_s": mean(result["first_s"] for result in scores),
+            "silence_s": mean(result["silence_s"] for result in scores),
+            "outputs": sum(result["outputs"] for result in scores),
+            "seconds": time.perf_counter() - start,
+        }
+        results.append(result)
+        print(
+            f"target_tps {target_tps:5.2f}  lead_time {lead_time:5.2f}  "
+            f"first_s {result['first_s']:6.2f}  silence_s {result['silence_s']:6.2f}  "
+            f"outputs {result['outputs']:5d}  ({result['seconds']:.2f} s)",
+            file=sys.stderr,
+        )
+
+    if args.output:
+        args.output.write_text(json.dumps(results, indent=2) + "\n", encoding="utf-8")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,186 @@
+"""Measure SentenceSplitter throughput and per-chunk latency.
+
+Every case from cases.py is streamed through a SentenceSplitter for each
+tokenizer and configuration: the chunks are passed to add() one at a time
+and stream() is drained after each. The results are written as JSON so runs
+on different commits can be compared with compare.py:
+
+    python benchmarks/run_benchmarks.py --output before.json
+    git checkout other-branch
+    python benchmarks/run_benchmarks.py --output after.json
+    python benchmarks/compare.py before.json after.json
+
+Tokenizers that cannot be initialized, for example because their optional
+dependency or model data is missing, are reported as skipped.
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(REPO_ROOT))
+
+from stream2sentence import SentenceSplitter, init_tokenizer  # noqa: E402
+
+from cases import all_cases  # noqa: E402
+
+
+TOKENIZERS = ("rule-based", "nltk", "nltk+rule-based", "stanza")
+
+CONFIGS = {
+    "default": {},
+    "auto-context": {"auto_context": True},
+    "quick-first": {"quick_yield_single_sentence_fragment": True},
+    "quick-all": {"quick_yield_for_all_sentences": True},
+    "quick-every": {"quick_yield_every_fragment": True},
+}
+
+
+def run_stream(chunks, tokenizer, config, step_times=None):
+    """Streams chunks through a new splitter and returns its sentences."""
+    splitter = SentenceSplitter(tokenizer=tokenizer, **config)
+    sentences = []
+    clock = time.perf_counter_ns
+    for chunk in chunks:
+        start = clock()
+        splitter.add(chunk)
+        sentences.extend(splitter.stream())
+        if step_times is not None:
+            step_times.append(clock() - start)
+    sentences.extend(splitter.flush())
+    return sentences
+
+
+def percentile(sorted_values, fraction):
+    index = min(len(sorted_values) - 1, int(fraction * len(sorted_values)))
+    return sorted_values[index]
+
+
+def measure(chunks, tokenizer, config, repeat, allocations):
+    best_seconds = None
+    step_times = []
+    for _ in range(repeat):
+        run_step_times = []
+        start = time.perf_counter()
+        sentences = run_stream(chunks, tokenizer, config, run_step_times)
+        seconds = time.perf_counter() - start
+        step_times.extend(run_step_times)
+        if best_seconds is None or seconds < best_seconds:
+            best_seconds = seconds
+
+    step_times.sort()
+    characters = sum(map(len, chunks))
+    result = {
+        "chars": characters,
+        "chunks": len(chunks),
+        "sentences": len(sentences),
+        "output_sha1": hashlib.sha1("\x00".join(sentences).encode("utf-8")).hexdigest(),
+        "seconds": best_seconds,
+        "chars_per_sec": characters / best_seconds if best_seconds else None,
+        "step_us_p50": percentile(step_times, 0.5) / 1000,
+        "step_us_p99": percentile(step_times, 0.99) / 1000,
+        "step_us_max": step_times[-1] / 1000,
+    }
+
+    if allocations:
+        tracemalloc.start()
+        try:
+            run_stream(chunks, tokenizer, config)
+            result["alloc_peak_kib"] = tracemalloc.get_traced_memory()[1] / 1024
+        finally:
+            tracemalloc.stop()
+    return result
+
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            capture_output=True,
+            check=True,
+            cwd=REPO_ROOT,
+            text=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--output", type=Path, help="Write the JSON results to this file.")
+    parser.add_argument("--tokenizers", nargs="+", default=list(TOKENIZERS), choices=TOKENIZERS)
+    parser.add_argument("--configs", nargs="+", default=list(CONFIGS), choices=list(CONFIGS))
+    parser.add_argument("--cases", nargs="+", help="Only run these cases.")
+    parser.add_argument("--repeat", type=int, default=3, help="Timed runs per benchmark.")
+    parser.add_argument("--scale", type=int, default=1, help="Length multiplier of synthetic cases.")
+    parser.add_argument(
+        "--no-allocations",
+        dest="allocations",
+        action="store_false",
+        help="Skip the extra tracemalloc run of every benchmark.",
+    )
+    parser.add_argument(
+        "--offline",
+        action="store_true",
+        help="Do not download tokenizer models that are missing.",
+    )
+    args = parser.parse_args()
+
+    cases = all_cases(args.scale)
+    if args.cases:
+        cases = {name: cases[name] for name in args.cases}
+
+    report = {
+        "commit": git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "time": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "skipped": {},
+        "results": [],
+    }
+    for tokenizer in args.tokenizers:
+        try:
+            init_tokenizer(tokenizer, offline=args.offline)
+        except Exception as exc:  # missing extras, models or data
+            report["skipped"][tokenizer] = f"{type(exc).__name__}: {exc}"
+            print(f"skipping {tokenizer}: {exc}", file=sys.stderr)
+            continue
+
+        for config_name in args.configs:
+            for case_name, chunks in cases.items():
+                result = measure(
+                    chunks,
+                    tokenizer,
+                    CONFIGS[config_name],
+                    args.repeat,
+                    args.allocations,
+                )
+                result.update(tokenizer=tokenizer, config=config_name, case=case_name)
+                report["results"].append(result)
+                print(
+                    f"{tokenizer:16} {config_name:13} {case_name:16} "
+                    f"{result['chars_per_sec']:>10.0f} chars/s  "
+                    f"p50 {result['step_us_p50']:>8.1f} us  "
+                    f"p99 {result['step_us_p99']:>8.1f} us",
+                    file=sys.stderr,
+                )
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        args.output.write_text(text + "\n", encoding="utf-8")
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
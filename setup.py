@@ -13,16 +13,14 @@ setuptools.setup(
     long_description_content_type="text/markdown",
     url="https://github.com/KoljaB/stream2sentence",
     packages=setuptools.find_packages(),
-    package_data={"stream2sentence": ["data/*.json"]},
+    package_data={"stream2sentence": ["data/*.json", "data/bundles/*.json"]},
     classifiers=[
         "Programming Language :: Python :: 3",
         "License :: OSI Approved :: MIT License",
         "Operating System :: OS Independent",
     ],
     python_requires='>=3.10',
-    install_requires=[
-        'emoji>=2.15.0,<3',
-    ],
+    install_requires=[],
     extras_require={
         'nltk': ['nltk>=3.10.0,<4'],
         'stanza': ['stanza>=1.14.0,<2'],
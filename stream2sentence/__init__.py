@@ -1,14 +1,47 @@
+import importlib
+
 from .stream2sentence import (
     generate_sentences,
     generate_sentences_async,
     init_tokenizer,
     SentenceSplitter,
-)
-
-from .stream2sentence_time_based import (
-    generate_sentences_time_based,
+    YieldEvent,
 )
 
 from .avoid_pause_words import (
     AVOID_PAUSE_WORDS,
 )
+
+
+_TIME_BASED_NAMES = {
+    "TimeBasedSentenceSplitter",
+    "generate_sentences_time_based",
+    "generate_sentences_time_based_async",
+}
+
+__all__ = [
+    "generate_sentences",
+    "generate_sentences_async",
+    "init_tokenizer",
+    "SentenceSplitter",
+    "YieldEvent",
+    "AVOID_PAUSE_WORDS",
+    "TimeBasedSentenceSplitter",
+    "generate_sentences_time_based",
+    "generate_sentences_time_based_async",
+]
+
+
+def __getattr__(name):
+    # The time based strategy is imported on first use
+    if name == "stream2sentence_time_based":
+        return importlib.import_module(f"{__name__}.{name}")
+    if name in _TIME_BASED_NAMES:
+        from . import stream2sentence_time_based
+
+        return getattr(stream2sentence_time_based, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(__all__)
@@ -4,7 +4,9 @@ Context checks for low-latency sentence fragment boundaries.
 
 import json
 import os
+import re
 import unicodedata
+from bisect import bisect_left, bisect_right
 from functools import lru_cache
 
 
@@ -16,6 +18,23 @@ _OPENING_MARKS = "\"'([{“‘«‹"
 _CLOSING_MARKS = "\"')]}”’»›"
 _TERMINAL_MARKS = ".?!？"
 
+# No rule reads more than this many tokens to the right of a delimiter.
+_MAX_RIGHT_CONTEXT_TOKENS = 4
+# No rule reads more than this many tokens up to and including the delimiter.
+_MAX_LEFT_CONTEXT_TOKENS = 6
+# Neither side of a delimiter is read further than this many characters, so a
+# single huge token (minified JSON, long URLs) has a bounded cost per decision.
+_MAX_CONTEXT_CHARS = 256
+
+_RIGHT_CONTEXT_GAP = re.compile(rf"[\s{re.escape(_OPENING_MARKS + '.;:,)]}')}]*")
+_RIGHT_CONTEXT_TOKEN = re.compile(r"[^\s.?!;:,)\]}]*")
+
+_BRACKET_OPENERS = {")": "(", "]": "[", "}": "{"}
+_BRACKET_CLOSERS = {opener: closer for closer, opener in _BRACKET_OPENERS.items()}
+_BRACKET_PATTERN = re.compile(r"[()\[\]{}]")
+_URL_EVENT_PATTERN = re.compile(r"\s|://")
+_WHITESPACE_PATTERN = re.compile(r"\s")
+
 _EN_AMBIGUOUS_ABBREVIATIONS = {
     "a.d.",
     "a.m.",
@@ -1145,6 +1164,11 @@ _EN_PUNCTUATED_NAME_CONTINUATIONS = {
 
 
 _LANGUAGE_CONTEXTS = None
+_LANGUAGE_ALIASES = None
+
+# Detector data, one JSON file per language plus "aliases", written by
+# tools/build_language_bundles.py from language_contexts.json.
+_BUNDLE_DIRECTORY = os.path.join(os.path.dirname(__file__), "data", "bundles")
 
 
 def _load_language_contexts():
@@ -1156,16 +1180,39 @@ def _load_language_contexts():
     return _LANGUAGE_CONTEXTS
 
 
-def _normalize_language(language):
-    contexts = _load_language_contexts()
-    language = (language or contexts["default_language"]).lower()
+def _load_bundle(name):
+    with open(os.path.join(_BUNDLE_DIRECTORY, f"{name}.json"), encoding="utf-8") as file:
+        return json.load(file)
 
+
+def _build_language_aliases():
+    """
+    Returns the default language and a map from every language code and
+    alias to its language code. The first language listing an alias wins.
+    """
+    contexts = _load_language_contexts()
+    aliases = {}
     for code, context in contexts["languages"].items():
-        aliases = [code] + context.get("aliases", [])
-        if language in aliases:
-            return code
+        for alias in [code] + context.get("aliases", []):
+            aliases.setdefault(alias, code)
+    return {"default_language": contexts["default_language"], "aliases": aliases}
 
-    return contexts["default_language"]
+
+def _load_language_aliases():
+    global _LANGUAGE_ALIASES
+    if _LANGUAGE_ALIASES is None:
+        try:
+            bundle = _load_bundle("aliases")
+        except OSError:
+            bundle = _build_language_aliases()
+        _LANGUAGE_ALIASES = bundle["default_language"], bundle["aliases"]
+    return _LANGUAGE_ALIASES
+
+
+def _normalize_language(language):
+    default_language, aliases = _load_language_aliases()
+    language = (language or default_language).lower()
+    return aliases.get(language, default_language)
 
 
 def _is_mark(char):
@@ -1183,10 +1230,43 @@ def _keep_english_abbreviation(abbreviation):
     return abbreviation in _EN_SINGLE_TOKEN_ABBREVIATIONS
 
 
-@lru_cache(maxsize=None)
-def _language_detector_config(language):
+def _reversed_abbreviation_trie(abbreviations):
+    """Builds a trie over the reversed abbreviations; "" keys mark their ends."""
+    trie = {}
+    for abbreviation in abbreviations:
+        node = trie
+        for char in reversed(abbreviation):
+            node = node.setdefault(char, {})
+        node[""] = abbreviation
+    return trie
+
+
+def _context_limits(abbreviations):
+    """
+    Returns the lookbehind tokens, lookahead tokens, lookbehind characters and
+    lookahead characters the rules read around a delimiter. The left side must
+    also hold the language's longest abbreviation and the token before it.
+    """
+    longest_tokens = max(
+        (len(abbreviation.split()) for abbreviation in abbreviations),
+        default=0,
+    )
+    longest_chars = max(map(len, abbreviations), default=0)
+    return (
+        max(_MAX_LEFT_CONTEXT_TOKENS, longest_tokens + 1),
+        _MAX_RIGHT_CONTEXT_TOKENS,
+        max(_MAX_CONTEXT_CHARS, longest_chars + 1),
+        _MAX_CONTEXT_CHARS,
+    )
+
+
+def _build_language_bundle(language):
+    """
+    Returns the detector data of a language code from language_contexts.json:
+    its abbreviations, longest first, the currency symbols and the context
+    limits.
+    """
     contexts = _load_language_contexts()
-    language = _normalize_language(language)
     generic = contexts["languages"]["generic"]
     language_context = contexts["languages"][language]
 
@@ -1199,13 +1279,136 @@ def _language_detector_config(language):
             if _keep_english_abbreviation(abbreviation)
         ]
 
+    abbreviations = sorted(
+        set(abbreviations), key=lambda abbreviation: (-len(abbreviation), abbreviation)
+    )
+    return {
+        "language": language,
+        "abbreviations": abbreviations,
+        "currency_symbols": sorted(generic.get("currency_symbols", [])),
+        "context_limits": list(_context_limits(abbreviations)),
+    }
+
+
+@lru_cache(maxsize=None)
+def _language_detector_config(language):
+    language = _normalize_language(language)
+    try:
+        bundle = _load_bundle(language)
+    except OSError:
+        bundle = _build_language_bundle(language)
+
+    abbreviations = tuple(bundle["abbreviations"])
     return (
-        language,
-        tuple(sorted(set(abbreviations), key=len, reverse=True)),
-        frozenset(generic.get("currency_symbols", [])),
+        bundle["language"],
+        abbreviations,
+        _reversed_abbreviation_trie(abbreviations),
+        frozenset(bundle["currency_symbols"]),
+        tuple(bundle["context_limits"]),
     )
 
 
+class BracketTracker:
+    """
+    Remembers where each bracket type was opened and closed in a growing
+    buffer, so closing brackets are classified without scanning the text
+    before them.
+    """
+
+    __slots__ = ("_offset", "_positions", "_opens")
+
+    def __init__(self, text=""):
+        self.reset(text)
+
+    def reset(self, text=""):
+        self._offset = 0
+        self._positions = {closer: [] for closer in _BRACKET_OPENERS}
+        self._opens = {closer: [] for closer in _BRACKET_OPENERS}
+        self.append(text, 0)
+
+    def append(self, text, index):
+        """Records the brackets in text, which starts at buffer index index."""
+        for match in _BRACKET_PATTERN.finditer(text):
+            bracket = match.group()
+            closer = _BRACKET_CLOSERS.get(bracket, bracket)
+            self._positions[closer].append(self._offset + index + match.start())
+            self._opens[closer].append(bracket != closer)
+
+    def consume(self, count):
+        """Forgets the first count characters of the buffer."""
+        self._offset += count
+        for closer, positions in self._positions.items():
+            stale = bisect_left(positions, self._offset)
+            if stale:
+                del positions[:stale]
+                del self._opens[closer][:stale]
+
+    def is_open_before(self, closer, index):
+        """
+        Returns True if the last bracket of closer's type before buffer index
+        index opens one, like comparing rfind() of the opener and the closer.
+        """
+        positions = self._positions[closer]
+        previous = bisect_left(positions, self._offset + index) - 1
+        return previous >= 0 and self._opens[closer][previous]
+
+
+class UrlTracker:
+    """
+    Remembers which tokens of a growing buffer contain "://", so a delimiter
+    inside a streamed URL is recognized without scanning back to the start
+    of its token.
+    """
+
+    __slots__ = ("_offset", "_schemes", "_ends", "_tail")
+
+    def __init__(self, text=""):
+        self.reset(text)
+
+    def reset(self, text=""):
+        self._offset = 0
+        # Position of the first "://" of each URL token and of the whitespace
+        # that ends the token, None while it is still open
+        self._schemes = []
+        self._ends = []
+        self._tail = ""
+        self.append(text, 0)
+
+    def append(self, text, index):
+        """Records the URL tokens in text, which starts at buffer index index."""
+        chunk = self._tail + text
+        start = self._offset + index - len(self._tail)
+        for match in _URL_EVENT_PATTERN.finditer(chunk):
+            position = start + match.start()
+            if match.group() == "://":
+                if position >= self._offset and (not self._ends or self._ends[-1] is not None):
+                    self._schemes.append(position)
+                    self._ends.append(None)
+            elif match.start() >= len(self._tail) and self._ends and self._ends[-1] is None:
+                self._ends[-1] = position
+        self._tail = chunk[-2:]
+
+    def consume(self, count):
+        """Forgets the first count characters of the buffer."""
+        self._offset += count
+        stale = bisect_left(self._schemes, self._offset)
+        if stale:
+            del self._schemes[:stale]
+            del self._ends[:stale]
+
+    def in_url_token(self, index):
+        """
+        Returns True if the token of the buffer that runs up to buffer index
+        index contains "://", like checking the last word of buffer[:index + 1].
+        """
+        position = self._offset + index
+        token = bisect_right(self._schemes, position - 2) - 1
+        if token < 0:
+            return False
+        end = self._ends[token]
+        return end is None or end > position
+
+
 @lru_cache(maxsize=None)
 def get_boundary_detector(language="en", never_split_numbers=False):
     return QuickYieldBoundaryDetector(language, never_split_numbers)
@@ -1215,10 +1418,29 @@ class QuickYieldBoundaryDetector:
     """Decides if a fragment delimiter is safe to yield immediately."""
 
     def __init__(self, language="en", never_split_numbers=False):
-        self.language, self.abbreviations, self.currency_symbols = _language_detector_config(language)
+        (
+            self.language,
+            self.abbreviations,
+            self._abbreviation_trie,
+            self.currency_symbols,
+            context_limits,
+        ) = _language_detector_config(language)
+        (
+            self.max_lookbehind_tokens,
+            self.max_lookahead_tokens,
+            self.max_lookbehind_chars,
+            self.max_lookahead_chars,
+        ) = context_limits
+        # Casefolding never shortens text, so this many trailing characters
+        # cover the longest abbreviation plus the character before it.
+        self._abbreviation_window = max(map(len, self.abbreviations), default=0) + 1
         self.never_split_numbers = never_split_numbers
 
-    def classify(self, buffer, delimiter_index, next_char=None):
+    def classify(self, buffer, delimiter_index, next_char=None, inside_url=None):
+        """
+        Classifies buffer[delimiter_index]. inside_url tells if the delimiter
+        is part of a token containing "://"; it is looked up in buffer if None.
+        """
         delimiter = buffer[delimiter_index]
 
         if delimiter in "\n\u3002\uff01":
@@ -1228,7 +1450,12 @@ class QuickYieldBoundaryDetector:
             return self._classify_exclamation_mark(buffer, delimiter_index)
 
         if delimiter in "?\uff1f":
-            return self._classify_question_mark(buffer, delimiter_index, next_char)
+            return self._classify_question_mark(
+                buffer,
+                delimiter_index,
+                next_char,
+                inside_url,
+            )
 
         if delimiter in ")]}":
             return REJECT if self._closes_bracketed_value(buffer, delimiter_index) else SPLIT
@@ -1247,6 +1474,123 @@ class QuickYieldBoundaryDetector:
 
         return SPLIT
 
+    def classify_at(
+        self,
+        text,
+        index,
+        start=0,
+        end=None,
+        next_char=None,
+        brackets=None,
+        urls=None,
+    ):
+        """
+        Classifies text[index] as classify() would for the buffer text[start:end],
+        copying only the window of tokens around the delimiter that rules read.
+        next_char defaults to the character after the delimiter. brackets and
+        urls are an optional BracketTracker and UrlTracker fed with text from
+        start.
+        """
+        if end is None:
+            end = len(text)
+        if next_char is None and index + 1 < end:
+            next_char = text[index + 1]
+
+        delimiter = text[index]
+        if delimiter in ")]}":
+            if brackets is not None:
+                closes_value = brackets.is_open_before(delimiter, index - start)
+            else:
+                closes_value = self._closes_bracketed_value(text, index, start)
+            return REJECT if closes_value else SPLIT
+
+        if urls is not None:
+            inside_url = urls.in_url_token(index - start)
+        elif delimiter in "?\uff1f":
+            # A URL token can be longer than the window, so it is looked up in all of text[start:]
+            inside_url = self._inside_url_token(text, index, start)
+        else:
+            inside_url = None
+
+        window_start, window_end = self.context_window(text, index, start, end)
+        return self.classify(
+            text[window_start:window_end],
+            index - window_start,
+            next_char,
+            inside_url,
+        )
+
+    def context_window(self, text, index, start=0, end=None):
+        """
+        Returns the (start, end) bounds of the part of text[start:end] that the
+        rules read to classify text[index]: at most max_lookbehind_tokens and
+        max_lookbehind_chars up to the delimiter, and max_lookahead_tokens
+        tokens plus one more, or max_lookahead_chars, after it.
+        """
+        if end is None:
+            end = len(text)
+
+        window_end = self._right_context_end(text, index, end)
+        return (
+            self._left_context_start(text, index, start),
+            end if window_end is None else window_end,
+        )
+
+    def has_stable_right_context(self, buffer, delimiter_index):
+        """
+        Returns True once more text follows the delimiter than any rule reads,
+        so appending text to the buffer can no longer change its classification.
+        """
+        return self._right_context_end(buffer, delimiter_index, len(buffer)) is not None
+
+    def _left_context_start(self, text, index, start):
+        """
+        Returns where the last max_lookbehind_tokens tokens up to text[index]
+        begin, right after whitespace, or start if there are fewer. Never
+        reaches back more than max_lookbehind_chars.
+        """
+        floor = max(start, index + 1 - self.max_lookbehind_chars)
+        left = text[floor:index + 1]
+        position = len(left)
+        tokens = 0
+
+        for token in reversed(left.split()):
+            position = left.rfind(token, 0, position)
+            if token.strip(_OPENING_MARKS + _CLOSING_MARKS + ".,;:!?"):
+                tokens += 1
+                if tokens >= self.max_lookbehind_tokens:
+                    return floor + position
+
+        return floor
+
+    def _right_context_end(self, text, index, end):
+        """
+        Returns the index one past the character that follows the first token
+        after text[index] that no rule reads, or where max_lookahead_chars run
+        out, or None if text[:end] ends first.
+        """
+        limit = min(end, index + 1 + self.max_lookahead_chars)
+        index += 1
+        tokens = 0
+
+        while index < limit:
+            index = _RIGHT_CONTEXT_GAP.match(text, index, limit).end()
+            if index >= limit:
+                break
+
+            token_start = index
+            index = _RIGHT_CONTEXT_TOKEN.match(text, index, limit).end()
+
+            if text[token_start:index].strip(_OPENING_MARKS + _CLOSING_MARKS + ".,;:!?"):
+                tokens += 1
+                if tokens > self.max_lookahead_tokens:
+                    return min(index + 1, end)
+
+            if index == token_start:
+                index += 1
+
+        return limit if limit < end else None
+
     def is_high_confidence_sentence_boundary(self, buffer, delimiter_index):
         if self.language != "en" or delimiter_index < 0:
             return False
@@ -1323,8 +1667,10 @@ class QuickYieldBoundaryDetector:
         continuation_action = self._classify_terminal_continuation(buffer, delimiter_index)
         return continuation_action if continuation_action is not None else SPLIT
 
-    def _classify_question_mark(self, buffer, delimiter_index, next_char):
-        if not self._inside_url_token(buffer, delimiter_index):
+    def _classify_question_mark(self, buffer, delimiter_index, next_char, inside_url=None):
+        if inside_url is None:
+            inside_url = self._inside_url_token(buffer, delimiter_index)
+        if not inside_url:
             punctuated_name_action = self._classify_punctuated_name(buffer, delimiter_index)
             if punctuated_name_action != SPLIT:
                 return punctuated_name_action
@@ -1403,16 +1749,26 @@ class QuickYieldBoundaryDetector:
         return REJECT if self._continues_token(next_char) else SPLIT
 
     def _matching_abbreviation(self, text):
-        folded = text.casefold()
-        for abbreviation in self.abbreviations:
-            if not folded.endswith(abbreviation):
-                continue
+        folded = text[-self._abbreviation_window:].casefold()
+
+        # Walk the reversed trie from the end of the text, collecting every
+        # abbreviation that is a suffix, shortest first.
+        matches = []
+        node = self._abbreviation_trie
+        start = len(folded)
+        while start > 0:
+            node = node.get(folded[start - 1])
+            if node is None:
+                break
+            start -= 1
+            if "" in node:
+                matches.append((node[""], start))
 
-            prefix = folded[: -len(abbreviation)]
-            if not prefix:
+        for abbreviation, start in reversed(matches):
+            if not start:
                 return abbreviation
 
-            previous = prefix[-1]
+            previous = folded[start - 1]
             if previous.isspace() or previous in _OPENING_MARKS + "/":
                 return abbreviation
             if abbreviation in _EN_AMBIGUOUS_ABBREVIATIONS and previous.isdigit():
@@ -2033,7 +2389,11 @@ class QuickYieldBoundaryDetector:
         buffer,
         delimiter_index,
     ):
-        tokens, last_complete = self._next_raw_tokens(buffer, delimiter_index, 4)
+        tokens, last_complete = self._next_raw_tokens(
+            buffer,
+            delimiter_index,
+            _MAX_RIGHT_CONTEXT_TOKENS,
+        )
         if not tokens:
             return HOLD
 
@@ -2102,7 +2462,11 @@ class QuickYieldBoundaryDetector:
         return None
 
     def _classify_next_phrase(self, buffer, delimiter_index, phrases):
-        tokens, last_complete = self._next_clean_tokens(buffer, delimiter_index, 4)
+        tokens, last_complete = self._next_clean_tokens(
+            buffer,
+            delimiter_index,
+            _MAX_RIGHT_CONTEXT_TOKENS,
+        )
         if not tokens:
             return HOLD
 
@@ -2486,12 +2850,14 @@ class QuickYieldBoundaryDetector:
             return ""
         return before_current[0].rsplit(None, 1)[-1].strip(_OPENING_MARKS + _CLOSING_MARKS)
 
-    def _closes_bracketed_value(self, buffer, delimiter_index):
+    def _closes_bracketed_value(self, buffer, delimiter_index, start=0):
         delimiter = buffer[delimiter_index]
         opener = {"}": "{", "]": "[", ")": "("}[delimiter]
-        left = buffer[:delimiter_index]
 
-        return left.rfind(opener) > left.rfind(delimiter)
+        return (
+            buffer.rfind(opener, start, delimiter_index)
+            > buffer.rfind(delimiter, start, delimiter_index)
+        )
 
     def _continues_token(self, char):
         return self._is_token_char(char) or char in "./:-\\?"
@@ -2504,9 +2870,9 @@ class QuickYieldBoundaryDetector:
             or char in "_/@#%+=~\\&"
         )
 
-    def _inside_url_token(self, buffer, delimiter_index):
-        token = self._current_token(buffer[:delimiter_index + 1])
-        return "://" in token
+    def _inside_url_token(self, buffer, delimiter_index, start=0):
+        scheme = buffer.rfind("://", start, delimiter_index + 1)
+        return scheme >= 0 and _WHITESPACE_PATTERN.search(buffer, scheme, delimiter_index + 1) is None
 
     @staticmethod
     def _current_token(text):
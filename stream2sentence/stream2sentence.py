@@ -6,34 +6,53 @@ from a continuous stream of characters or text chunks
 import collections
 import functools
 import importlib
+import itertools
+import json
 import logging
+import os
 import re
+import threading
 import time
+from array import array
 from typing import (
     AsyncIterable,
     AsyncIterator,
-    Awaitable,
     Callable,
-    Concatenate,
     Iterable,
     Iterator,
+    NamedTuple,
     Optional,
-    ParamSpec,
 )
 
-import emoji
-
-from stream2sentence.quick_yield_boundary import HOLD, REJECT, SPLIT, get_boundary_detector
+from stream2sentence.quick_yield_boundary import (
+    HOLD,
+    REJECT,
+    SPLIT,
+    BracketTracker,
+    UrlTracker,
+    get_boundary_detector,
+)
 
 current_tokenizer = "rule-based"
 current_language = "en"
 stanza_initialized = False
 nltk_initialized = False
 nlp = None
+_emoji_table = None
 
 _QUICK_YIELD_TERMINATORS = ".?!。！？؟।"
 _QUICK_YIELD_CLOSING_MARKS = "\"')]}”’»›"
 _QUICK_YIELD_PRE_TERMINAL_CLOSING_MARKS = ")]}"
+_SENTENCE_TERMINATORS = frozenset(".?!。！？؟।")
+_SENTENCE_TERMINATOR_PATTERN = re.compile("[.?!。！？؟।]")
+_LINK_PATTERN = re.compile(
+    r"http[s]?://(?:[a-zA-Z]|[0-9]|[$-_@.&+]|"
+    r"[!*\(\),]|(?:%[0-9a-fA-F][0-9a-fA-F]))+"
+)
+# Complete words that must follow a boundary before the tokenizers cannot move it
+_STABLE_BOUNDARY_TOKENS = 5
+# Below this many characters split_many does not start a process pool
+_SPLIT_MANY_POOL_MIN_CHARACTERS = 1 << 20
 
 
 def _normalize_tokenizer(tokenizer: str) -> str:
@@ -64,6 +83,46 @@ def _load_optional_dependency(module_name: str, extra: str, tokenizer: str):
         ) from exc
 
 
+class _TokenizerRegistry:
+    """
+    Thread-safe store of the tokenizer backends loaded in this process.
+
+    Backends are created lazily on first use and shared by all splitters:
+    one stanza pipeline per language, each guarded by its own lock so that
+    splitters running in different threads never call it concurrently.
+    """
+
+    def __init__(self):
+        self.lock = threading.RLock()
+        self._stanza_pipelines = {}
+
+    def stanza_pipeline(self, language: str, offline=False):
+        entry = self._stanza_pipelines.get(language)
+        if entry is None:
+            with self.lock:
+                entry = self._stanza_pipelines.get(language)
+                if entry is None:
+                    logging.info("Initializing Stanza Tokenizer")
+                    stanza = _load_optional_dependency("stanza", "stanza", "stanza")
+                    if not offline:
+                        stanza.download(language)
+                    entry = (
+                        stanza.Pipeline(language, download_method=None),
+                        threading.Lock(),
+                    )
+                    self._stanza_pipelines[language] = entry
+        return entry
+
+    def stanza_sentences(self, text: str, language: str) -> list[str]:
+        pipeline, pipeline_lock = self.stanza_pipeline(language)
+        with pipeline_lock:
+            doc = pipeline(text)
+        return [sentence.text for sentence in doc.sentences]
+
+
+_tokenizer_registry = _TokenizerRegistry()
+
+
 def initialize_nltk(language: str = "en", debug=False):
     """
     Initializes NLTK by downloading required data for sentence tokenization.
@@ -72,35 +131,32 @@ def initialize_nltk(language: str = "en", debug=False):
     if nltk_initialized:
         return
 
-    logging.info("Initializing NLTK Tokenizer")
+    with _tokenizer_registry.lock:
+        if nltk_initialized:
+            return
 
-    nltk = _load_optional_dependency("nltk", "nltk", "nltk")
+        logging.info("Initializing NLTK Tokenizer")
 
-    try:
-        nltk.data.find("tokenizers/punkt_tab")
-    except LookupError:
-        if not nltk.download("punkt_tab", quiet=not debug):
-            raise RuntimeError("Could not download nltk punkt_tab data")
-        nltk.data.find("tokenizers/punkt_tab")
-    nltk_initialized = True
+        nltk = _load_optional_dependency("nltk", "nltk", "nltk")
+
+        try:
+            nltk.data.find("tokenizers/punkt_tab")
+        except LookupError:
+            if not nltk.download("punkt_tab", quiet=not debug):
+                raise RuntimeError("Could not download nltk punkt_tab data")
+            nltk.data.find("tokenizers/punkt_tab")
+        nltk_initialized = True
 
 
 def initialize_stanza(language: str = "en", offline=False):
     """
     Initializes Stanza by downloading required data for sentence tokenization.
+
+    Each language gets its own pipeline; `nlp` refers to the most recently
+    initialized one.
     """
     global nlp, stanza_initialized
-    if stanza_initialized:
-        return
-
-    logging.info("Initializing Stanza Tokenizer")
-
-    stanza = _load_optional_dependency("stanza", "stanza", "stanza")
-
-    if not offline:
-        stanza.download(language)
-
-    nlp = stanza.Pipeline(language, download_method=None)
+    nlp = _tokenizer_registry.stanza_pipeline(language, offline=offline)[0]
     stanza_initialized = True
 
 
@@ -114,44 +170,75 @@ def _remove_links(text: str) -> str:
     Returns:
         str: Text with links removed
     """
-    pattern = (
-        r"http[s]?://(?:[a-zA-Z]|[0-9]|[$-_@.&+]|"
-        r"[!*\(\),]|(?:%[0-9a-fA-F][0-9a-fA-F]))+"
-    )
-
-    return re.sub(pattern, "", text)
+    if "://" not in text:
+        return text
+    return _LINK_PATTERN.sub("", text)
 
 
-def _remove_emojis(text: str) -> str:
+def _load_emoji_table():
     """
-    Removes emojis from the input text.
+    Returns a regex finding characters that can start an emoji and the trie
+    of all emoji sequences, precompiled by tools/build_emoji_table.py.
+    """
+    global _emoji_table
+    if _emoji_table is None:
+        path = os.path.join(os.path.dirname(__file__), "data", "emoji.json")
+        with open(path, encoding="utf-8") as file:
+            table = json.load(file)
+        _emoji_table = re.compile(f"[{table['ranges']}]"), table["trie"]
+    return _emoji_table
 
-    Args:
-        text (str): Input text
 
-    Returns:
-        str: Text with emojis removed
+def _emoji_end(text: str, start: int, trie: dict) -> int:
+    """
+    Returns where the longest emoji starting at text[start] ends, including
+    a zero width joiner that links it to the next emoji, or start if there
+    is none.
     """
-    return emoji.replace_emoji(text, "")
+    end = start
+    node = trie
+    for index in range(start, len(text)):
+        node = node.get(text[index])
+        if node is None:
+            break
+        joinable = node.get("")
+        if joinable is not None:
+            end = index + 1
+            if joinable and text.startswith("\u200d", end):
+                end += 1
+    return end
 
 
-def _generate_characters_from_chunk(
-    chunk: str, log_characters: bool = False
-) -> Iterator[str]:
+def _remove_emojis(text: str) -> str:
     """
-    Generates individual characters from a text.
+    Removes emojis from the input text.
 
     Args:
-        chunk (str): Input text
-        log_characters (bool): Whether to log the characters to the console
+        text (str): Input text
 
-    Yields:
-        Individual characters from the text
+    Returns:
+        str: Text with emojis removed
     """
-    for char in chunk:
-        if log_characters:
-            print(char, end="", flush=True)
-        yield char
+    # Every emoji has a code point above ASCII, keycaps included
+    if text.isascii():
+        return text
+
+    candidates, trie = _load_emoji_table()
+    pieces = []
+    kept = position = 0
+    while True:
+        match = candidates.search(text, position)
+        if match is None:
+            break
+        start = match.start()
+        position = _emoji_end(text, start, trie)
+        if position > start:
+            pieces.append(text[kept:start])
+            kept = position
+        else:
+            position += 1
+    pieces.append(text[kept:])
+    return "".join(pieces)
 
 
 def _clean_text(
@@ -188,6 +275,9 @@ def _tokenize_sentences(
     tokenizer: Optional[str] = None,
     language: Optional[str] = None,
     never_split_numbers: bool = False,
+    rule_based_tokenizer: Optional["_IncrementalRuleBasedTokenizer"] = None,
+    sentence_cache: Optional["_StableSentenceCache"] = None,
+    punkt_decisions: Optional["_PunktDecisionCache"] = None,
 ) -> list[str]:
     """
     Tokenizes sentences from the input text.
@@ -196,6 +286,15 @@ def _tokenize_sentences(
         text (str): Input text
         tokenize_sentences (Callable, optional): A function that tokenizes
           sentences from the input text. Defaults to None.
+        rule_based_tokenizer (_IncrementalRuleBasedTokenizer, optional):
+          Stateful rule-based tokenizer reused across calls on a growing
+          buffer. Defaults to None.
+        sentence_cache (_StableSentenceCache, optional): Memo of settled
+          sentences reused across nltk and stanza calls on a growing buffer.
+          Defaults to None.
+        punkt_decisions (_PunktDecisionCache, optional): Makes
+          "nltk+rule-based" ask Punkt only about the rule-based candidate
+          boundaries and remembers its answers. Defaults to None.
 
     Yields:
         Iterator[str]: An iterator of sentences
@@ -209,23 +308,36 @@ def _tokenize_sentences(
 
         if tokenizer == "nltk":
             nltk = _load_optional_dependency("nltk", "nltk", "nltk")
-            sentences = nltk.tokenize.sent_tokenize(text)
+            if sentence_cache is not None:
+                sentences = sentence_cache.tokenize(text, nltk.tokenize.sent_tokenize)
+            else:
+                sentences = nltk.tokenize.sent_tokenize(text)
         elif tokenizer == "rule-based":
-            sentences = _rule_based_tokenize_sentences(
-                text,
-                language,
-                never_split_numbers=never_split_numbers,
-            )
+            if rule_based_tokenizer is not None:
+                sentences = rule_based_tokenizer.tokenize(text)
+            else:
+                sentences = _rule_based_tokenize_sentences(
+                    text,
+                    language,
+                    never_split_numbers=never_split_numbers,
+                )
         elif tokenizer == "nltk+rule-based":
             sentences = _nltk_rule_based_tokenize_sentences(
                 text,
                 language,
                 never_split_numbers=never_split_numbers,
+                rule_based_tokenizer=rule_based_tokenizer,
+                sentence_cache=sentence_cache,
+                punkt_decisions=punkt_decisions,
             )
         elif tokenizer == "stanza":
-            global nlp
-            doc = nlp(text)
-            sentences = [sentence.text for sentence in doc.sentences]
+            if sentence_cache is not None:
+                sentences = sentence_cache.tokenize(
+                    text,
+                    functools.partial(_stanza_tokenize_sentences, language=language),
+                )
+            else:
+                sentences = _stanza_tokenize_sentences(text, language)
         else:
             raise ValueError(f"Unknown tokenizer: {tokenizer}")
         nlp_end_time = time.time()
@@ -233,52 +345,234 @@ def _tokenize_sentences(
     return sentences
 
 
+def _tokenize_sentence_spans(
+    text: str,
+    tokenizer: Optional[str] = None,
+    language: Optional[str] = None,
+    never_split_numbers: bool = False,
+    rule_based_tokenizer: Optional["_IncrementalRuleBasedTokenizer"] = None,
+    sentence_cache: Optional["_StableSentenceCache"] = None,
+    punkt_decisions: Optional["_PunktDecisionCache"] = None,
+) -> array:
+    """
+    Tokenizes sentences from the input text with one of the built-in
+    tokenizers and returns where they are instead of copying them.
+
+    Args:
+        text (str): Input text
+        rule_based_tokenizer (_IncrementalRuleBasedTokenizer, optional):
+          Stateful rule-based tokenizer reused across calls on a growing
+          buffer. Defaults to None.
+        sentence_cache (_StableSentenceCache, optional): Memo of settled
+          sentences reused across nltk and stanza calls on a growing buffer.
+          Defaults to None.
+        punkt_decisions (_PunktDecisionCache, optional): Makes
+          "nltk+rule-based" ask Punkt only about the rule-based candidate
+          boundaries and remembers its answers. Defaults to None.
+
+    Returns:
+        array: The start and end offset of each sentence in text, flattened
+          into one array('I').
+    """
+    nlp_start_time = time.time()
+    tokenizer = _normalize_tokenizer(tokenizer or current_tokenizer)
+    language = language or current_language
+
+    if tokenizer == "rule-based":
+        if rule_based_tokenizer is None:
+            rule_based_tokenizer = _IncrementalRuleBasedTokenizer(
+                language,
+                never_split_numbers,
+            )
+        spans = rule_based_tokenizer.tokenize_spans(text)
+    elif tokenizer == "nltk+rule-based":
+        spans = _nltk_rule_based_tokenize_spans(
+            text,
+            language,
+            never_split_numbers,
+            rule_based_tokenizer,
+            sentence_cache,
+            punkt_decisions,
+        )
+    else:
+        if tokenizer == "nltk":
+            nltk = _load_optional_dependency("nltk", "nltk", "nltk")
+            tokenize = nltk.tokenize.sent_tokenize
+        elif tokenizer == "stanza":
+            tokenize = functools.partial(_stanza_tokenize_sentences, language=language)
+        else:
+            raise ValueError(f"Unknown tokenizer: {tokenizer}")
+
+        if sentence_cache is not None:
+            spans = sentence_cache.tokenize_spans(text, tokenize)
+        else:
+            spans = _spans_of_sentences(text, tokenize(text))
+    nlp_end_time = time.time()
+    logging.debug("Time to split sentences: " f"{nlp_end_time - nlp_start_time}")
+    return spans
+
+
+def _stanza_tokenize_sentences(text: str, language: str = "en") -> list[str]:
+    return _tokenizer_registry.stanza_sentences(text, language)
+
+
 def _rule_based_tokenize_sentences(
     text: str,
     language: str = "en",
     never_split_numbers: bool = False,
 ) -> list[str]:
-    detector = get_boundary_detector(language, never_split_numbers)
-    sentence_terminators = set(".?!。！？؟।")
-    closing_marks = "\"')]}”’»›"
-    sentences = []
-    start = 0
-    index = 0
+    return _IncrementalRuleBasedTokenizer(language, never_split_numbers).tokenize(text)
 
-    while index < len(text):
-        char = text[index]
-        if char not in sentence_terminators:
-            index += 1
-            continue
 
-        segment = text[start:]
-        next_char = text[index + 1] if index + 1 < len(text) else None
-        action = detector.classify(segment, index - start, next_char)
-        if action != SPLIT:
-            index += 1
-            continue
+class _IncrementalRuleBasedTokenizer:
+    """
+    Rule-based sentence tokenizer that remembers settled boundary decisions.
 
-        end = index + 1
-        while end < len(text) and text[end] in sentence_terminators:
-            end += 1
-        while end < len(text) and text[end] in closing_marks:
-            end += 1
+    A terminator is settled once the boundary detector has all the right
+    context it can read, so its SPLIT/REJECT decision cannot change when more
+    characters are appended. When the next text extends the previous one,
+    only the unsettled tail is classified again. Sentences are kept as
+    (start, end) offsets into the text.
+    """
 
-        sentence = text[start:end].strip()
-        if sentence:
-            sentences.append(sentence)
+    def __init__(self, language: str = "en", never_split_numbers: bool = False):
+        self.detector = get_boundary_detector(language, never_split_numbers)
+        self.reset()
 
-        while end < len(text) and text[end].isspace():
-            end += 1
+    def reset(self):
+        self._text = ""
+        self._spans = array("I")
+        self._start = 0
+        self._index = 0
+        self._result = array("I")
 
-        start = end
-        index = end
+    @property
+    def settled(self) -> bool:
+        """True if no boundary in the last tokenized text can still change."""
+        return self._index == len(self._text)
 
-    tail = text[start:].strip()
-    if tail:
-        sentences.append(tail)
+    def tokenize(self, text: str) -> list[str]:
+        return _sentences_from_spans(text, self.tokenize_spans(text))
 
-    return sentences
+    def tokenize_spans(self, text: str) -> array:
+        """
+        Returns the start and end offsets of the stripped sentences of text,
+        flattened into one array.
+        """
+        if text == self._text:
+            return array("I", self._result)
+        if not text.startswith(self._text):
+            self.reset()
+        self._text = text
+
+        detector = self.detector
+        spans = array("I", self._spans)
+        start = self._start
+        index = self._index
+        settled = True
+
+        while True:
+            match = _SENTENCE_TERMINATOR_PATTERN.search(text, index)
+            if match is None:
+                if settled:
+                    self._index = len(text)
+                break
+
+            index = match.start()
+            if settled:
+                self._index = index
+                settled = detector.has_stable_right_context(text, index)
+
+            action = detector.classify_at(text, index, start)
+            if action != SPLIT:
+                index += 1
+                if settled:
+                    self._index = index
+                continue
+
+            end = index + 1
+            while end < len(text) and text[end] in _SENTENCE_TERMINATORS:
+                end += 1
+            while end < len(text) and text[end] in _QUICK_YIELD_CLOSING_MARKS:
+                end += 1
+
+            sentence_start, sentence_end = _stripped_span(text, start, end)
+            if sentence_end > sentence_start:
+                spans.append(sentence_start)
+                spans.append(sentence_end)
+
+            while end < len(text) and text[end].isspace():
+                end += 1
+
+            start = end
+            index = end
+            if settled:
+                if sentence_end > sentence_start:
+                    self._spans.append(sentence_start)
+                    self._spans.append(sentence_end)
+                self._start = start
+                self._index = index
+
+        sentence_start, sentence_end = _stripped_span(text, start, len(text))
+        if sentence_end > sentence_start:
+            spans.append(sentence_start)
+            spans.append(sentence_end)
+
+        self._result = spans
+        return array("I", spans)
+
+
+def _stripped_span(text: str, start: int, end: int) -> tuple[int, int]:
+    while start < end and text[start].isspace():
+        start += 1
+    while end > start and text[end - 1].isspace():
+        end -= 1
+    return start, end
+
+
+def _sentences_from_spans(text: str, spans: array) -> list[str]:
+    return [text[spans[index]:spans[index + 1]] for index in range(0, len(spans), 2)]
+
+
+def _boundary_offsets_from_spans(text: str, spans: array) -> list[int]:
+    """
+    Returns where each sentence but the last ends, ignoring trailing
+    whitespace, like _sentence_boundary_offsets does for sentence strings.
+    """
+    offsets = []
+    for index in range(0, len(spans) - 2, 2):
+        start, end = _stripped_span(text, spans[index], spans[index + 1])
+        if end > start:
+            offsets.append(end)
+    return offsets
+
+
+def _spans_from_boundary_offsets(text: str, offsets: list[int]) -> array:
+    spans = array("I")
+    start = 0
+
+    for offset in offsets + [len(text)]:
+        sentence_start, sentence_end = _stripped_span(text, start, offset)
+        if sentence_end > sentence_start:
+            spans.append(sentence_start)
+            spans.append(sentence_end)
+        start = offset
+
+    return spans
+
+
+def _spans_of_sentences(text: str, sentences: list[str]) -> array:
+    """
+    Returns the spans of sentences returned by a tokenizer. Sentences that
+    are not slices of text are located like _sentence_boundary_offsets does.
+    """
+    spans = _sentence_spans(text, sentences)
+    if spans is None:
+        return _spans_from_boundary_offsets(
+            text,
+            _sentence_boundary_offsets(text, sentences),
+        )
+    return array("I", [offset for span in spans for offset in span])
 
 
 def _sentence_boundary_offsets(text: str, sentences: list[str]) -> list[int]:
@@ -304,60 +598,323 @@ def _sentence_boundary_offsets(text: str, sentences: list[str]) -> list[int]:
     return offsets
 
 
-def _sentences_from_boundary_offsets(text: str, offsets: list[int]) -> list[str]:
-    sentences = []
-    start = 0
+def _start_of_last_words(text: str, count: int, floor: int) -> int:
+    """
+    Returns where the last `count` complete words of text begin, ignoring a
+    word still being written at the end, or floor if there are fewer after it.
+    """
+    index = len(text)
+    while index > floor and not text[index - 1].isspace():
+        index -= 1
 
-    for offset in offsets:
-        sentence = text[start:offset].strip()
-        if sentence:
-            sentences.append(sentence)
-        start = offset
+    for _ in range(count):
+        while index > floor and text[index - 1].isspace():
+            index -= 1
+        while index > floor and not text[index - 1].isspace():
+            index -= 1
 
-    tail = text[start:].strip()
-    if tail:
-        sentences.append(tail)
+    return index
 
-    return sentences
+
+def _sentence_spans(text: str, sentences: list[str]) -> Optional[list[tuple[int, int]]]:
+    spans = []
+    search_start = 0
+
+    for sentence in sentences:
+        if not sentence:
+            continue
+
+        start = text.find(sentence, search_start)
+        if start < 0:
+            return None
+
+        search_start = start + len(sentence)
+        spans.append((start, search_start))
+
+    return spans
+
+
+class _StableSentenceCache:
+    """
+    Memo of the settled head of a growing buffer for tokenizers that return
+    slices of their input, like nltk and stanza.
+
+    A sentence boundary followed by _STABLE_BOUNDARY_TOKENS complete words
+    is settled: the sentences before it are kept and only the rest of the
+    buffer, starting at the last settled sentence, is tokenized again. The
+    tokenizer thus still sees the words on both sides of every boundary it
+    may move, like a closing quote or bracket detached from its sentence,
+    so the result matches tokenizing the whole buffer.
+
+    For model based tokenizers, left_context characters of settled text are
+    passed in front of the tail, and interval batches calls: the tokenizer
+    runs again only once that many characters arrived or one of delimiters
+    did, and in between the last sentence is extended with the new text.
+    """
+
+    def __init__(self, left_context: int = 0, interval: int = 1, delimiters: str = ""):
+        self.left_context = left_context
+        self.interval = interval
+        self.delimiters = frozenset(delimiters)
+        self.reset()
+
+    def reset(self):
+        self._head = ""
+        self._spans = array("I")
+        self.expire()
+
+    def expire(self):
+        """Makes the next call run the tokenizer regardless of interval."""
+        self._text = None
+        self._spans_before_last = None
+        self._last_start = 0
+        self._strip_last = False
+
+    def _context_start(self, text: str, head_length: int) -> int:
+        if not self.left_context or not head_length:
+            return head_length
+
+        start = max(0, head_length - self.left_context)
+        while start < head_length and start and not text[start - 1].isspace():
+            start += 1
+        return start
+
+    def tokenize(self, text: str, tokenize: Callable[[str], list[str]]) -> list[str]:
+        return _sentences_from_spans(text, self.tokenize_spans(text, tokenize))
+
+    def tokenize_spans(self, text: str, tokenize: Callable[[str], list[str]]) -> array:
+        """
+        Returns the start and end offsets of the sentences of text, flattened
+        into one array.
+        """
+        if (
+            self._spans_before_last is not None
+            and len(text) - len(self._text) < self.interval
+            and text.startswith(self._text)
+            and self.delimiters.isdisjoint(text[len(self._text):])
+        ):
+            end = len(text)
+            if self._strip_last:
+                end = _stripped_span(text, self._last_start, end)[1]
+            spans = array("I", self._spans_before_last)
+            spans.append(self._last_start)
+            spans.append(end)
+            return spans
+
+        if not text.startswith(self._head):
+            self.reset()
+
+        head_length = len(self._head)
+        context_start = self._context_start(text, head_length)
+        tail_sentences = tokenize(text[context_start:]) if len(text) > context_start else []
+        spans = _sentence_spans(text[context_start:], tail_sentences)
+        if spans is not None:
+            spans = [
+                (max(context_start + start, head_length), context_start + end)
+                for start, end in spans
+                if context_start + end > head_length
+            ]
+
+        if spans is None:
+            # The tokenizer rewrote its input, so the tail cannot be stitched
+            if not head_length:
+                return _spans_of_sentences(text, tail_sentences)
+            self.reset()
+            return _spans_of_sentences(text, tokenize(text))
+
+        result = array("I", self._spans)
+        for start, end in spans:
+            result.append(start)
+            result.append(end)
+        if self.interval > 1 and spans:
+            self._text = text
+            self._spans_before_last = result[:-2]
+            self._last_start = spans[-1][0]
+            self._strip_last = spans[-1][1] < len(text)
+
+        settled = _start_of_last_words(text, _STABLE_BOUNDARY_TOKENS, head_length)
+        last_settled = sum(1 for start, _ in spans if start < settled) - 1
+        if last_settled > 0:
+            for start, end in spans[:last_settled]:
+                self._spans.append(start)
+                self._spans.append(end)
+            self._head = text[:spans[last_settled][0]]
+
+        return result
+
+
+class _PunktDecisionCache:
+    """
+    Memo of Punkt's answer for single candidate boundaries.
+
+    Instead of tokenizing the whole buffer, Punkt is asked about one
+    rule-based candidate at a time, on the context window the boundary
+    detector reads around it. The answer depends only on that window, so it
+    is kept per window text and a streaming buffer asks about each candidate
+    once its right context has settled.
+    """
+
+    max_entries = 4096
+
+    def __init__(self):
+        self._decisions = {}
+
+    def splits_at(
+        self,
+        text: str,
+        offset: int,
+        detector,
+        sent_tokenize: Callable[[str], list[str]],
+    ) -> bool:
+        """Returns True if Punkt ends a sentence at text[offset - 1]."""
+        window_start, window_end = detector.context_window(text, offset - 1)
+        window = text[window_start:window_end]
+        key = (window, offset - window_start)
+        decision = self._decisions.get(key)
+        if decision is None:
+            if len(self._decisions) >= self.max_entries:
+                self._decisions.clear()
+            decision = key[1] in _boundary_offsets_from_spans(
+                window,
+                _spans_of_sentences(window, sent_tokenize(window)),
+            )
+            self._decisions[key] = decision
+        return decision
 
 
 def _nltk_rule_based_tokenize_sentences(
     text: str,
     language: str = "en",
     never_split_numbers: bool = False,
+    rule_based_tokenizer: Optional[_IncrementalRuleBasedTokenizer] = None,
+    sentence_cache: Optional[_StableSentenceCache] = None,
+    punkt_decisions: Optional[_PunktDecisionCache] = None,
 ) -> list[str]:
-    nltk = _load_optional_dependency("nltk", "nltk", "nltk+rule-based")
-    nltk_sentences = nltk.tokenize.sent_tokenize(text)
-    rule_based_sentences = _rule_based_tokenize_sentences(
+    return _sentences_from_spans(
         text,
-        language,
-        never_split_numbers=never_split_numbers,
+        _nltk_rule_based_tokenize_spans(
+            text,
+            language,
+            never_split_numbers,
+            rule_based_tokenizer,
+            sentence_cache,
+            punkt_decisions,
+        ),
     )
-    nltk_offsets = set(_sentence_boundary_offsets(text, nltk_sentences))
-    rule_based_offsets = set(_sentence_boundary_offsets(text, rule_based_sentences))
+
+
+def _nltk_rule_based_tokenize_spans(
+    text: str,
+    language: str = "en",
+    never_split_numbers: bool = False,
+    rule_based_tokenizer: Optional[_IncrementalRuleBasedTokenizer] = None,
+    sentence_cache: Optional[_StableSentenceCache] = None,
+    punkt_decisions: Optional[_PunktDecisionCache] = None,
+) -> array:
+    """
+    Returns the spans of the sentences that nltk and the rule-based
+    tokenizer agree on, plus rule-based boundaries the detector is highly
+    confident about.
+
+    Without punkt_decisions, nltk tokenizes the whole text. With it, only
+    the rule-based candidate boundaries are checked with Punkt, each on a
+    small window around it.
+    """
+    nltk = _load_optional_dependency("nltk", "nltk", "nltk+rule-based")
+    if punkt_decisions is not None:
+        return _nltk_rule_based_candidate_spans(
+            text,
+            language,
+            never_split_numbers,
+            rule_based_tokenizer,
+            punkt_decisions,
+            nltk.tokenize.sent_tokenize,
+        )
+    if sentence_cache is not None:
+        nltk_spans = sentence_cache.tokenize_spans(text, nltk.tokenize.sent_tokenize)
+    else:
+        nltk_spans = _spans_of_sentences(text, nltk.tokenize.sent_tokenize(text))
+    if rule_based_tokenizer is not None:
+        rule_based_spans = rule_based_tokenizer.tokenize_spans(text)
+    else:
+        rule_based_spans = _spans_of_sentences(
+            text,
+            _rule_based_tokenize_sentences(
+                text,
+                language,
+                never_split_numbers=never_split_numbers,
+            ),
+        )
+    nltk_offsets = set(_boundary_offsets_from_spans(text, nltk_spans))
+    rule_based_offsets = set(_boundary_offsets_from_spans(text, rule_based_spans))
     detector = get_boundary_detector(language, never_split_numbers)
-    override_offsets = {
-        offset for offset in rule_based_offsets - nltk_offsets
-        if detector.is_high_confidence_sentence_boundary(text, offset - 1)
-    }
+    override_offsets = set()
+    for offset in rule_based_offsets - nltk_offsets:
+        window_start, window_end = detector.context_window(text, offset - 1)
+        if detector.is_high_confidence_sentence_boundary(
+            text[window_start:window_end],
+            offset - 1 - window_start,
+        ):
+            override_offsets.add(offset)
     consensus_offsets = sorted((nltk_offsets & rule_based_offsets) | override_offsets)
 
-    return _sentences_from_boundary_offsets(text, consensus_offsets)
+    return _spans_from_boundary_offsets(text, consensus_offsets)
+
+
+def _nltk_rule_based_candidate_spans(
+    text: str,
+    language: str,
+    never_split_numbers: bool,
+    rule_based_tokenizer: Optional[_IncrementalRuleBasedTokenizer],
+    punkt_decisions: _PunktDecisionCache,
+    sent_tokenize: Callable[[str], list[str]],
+) -> array:
+    if rule_based_tokenizer is None:
+        rule_based_tokenizer = _IncrementalRuleBasedTokenizer(
+            language,
+            never_split_numbers,
+        )
+    rule_based_spans = rule_based_tokenizer.tokenize_spans(text)
+    detector = get_boundary_detector(language, never_split_numbers)
+    consensus_offsets = []
+    for offset in _boundary_offsets_from_spans(text, rule_based_spans):
+        if punkt_decisions.splits_at(text, offset, detector, sent_tokenize):
+            consensus_offsets.append(offset)
+            continue
+        window_start, window_end = detector.context_window(text, offset - 1)
+        if detector.is_high_confidence_sentence_boundary(
+            text[window_start:window_end],
+            offset - 1 - window_start,
+        ):
+            consensus_offsets.append(offset)
+
+    return _spans_from_boundary_offsets(text, consensus_offsets)
 
 
 def init_tokenizer(tokenizer: str, language: str = "en", offline=False, debug=False):
     """
-    Initializes the sentence tokenizer.
+    Initializes the sentence tokenizer and makes it the module default used
+    when _tokenize_sentences is called without a tokenizer.
     """
     global current_language, current_tokenizer
     tokenizer = _normalize_tokenizer(tokenizer)
+    if tokenizer == "stanza":
+        initialize_stanza(language, offline=offline)
+    else:
+        _initialize_tokenizer(tokenizer, language, offline=offline, debug=debug)
     current_tokenizer = tokenizer
     current_language = language
 
+
+def _initialize_tokenizer(tokenizer: str, language: str = "en", offline=False, debug=False):
+    """
+    Loads the backend of a normalized tokenizer without touching the module
+    defaults, so splitters with different settings do not interfere.
+    """
     if tokenizer == "nltk":
         initialize_nltk(language, debug)
     elif tokenizer == "stanza":
-        initialize_stanza(language, offline=offline)
+        _tokenizer_registry.stanza_pipeline(language, offline=offline)
     elif tokenizer == "rule-based":
         return
     elif tokenizer == "nltk+rule-based":
@@ -389,6 +946,9 @@ async def generate_sentences_async(
     debug=False,
     auto_context: bool = False,
     never_split_numbers: bool = False,
+    stanza_tokenize_interval: int = 1,
+    stanza_left_context: int = 200,
+    on_yield: Optional[Callable[["YieldEvent"], None]] = None,
 ) -> AsyncIterator[str]:
     """
     Generates well-formed sentences from a stream of characters or text chunks
@@ -454,6 +1014,15 @@ async def generate_sentences_async(
         never_split_numbers (bool): If True, bare integer tokens ending in a
           period, such as "1.", are treated as non-sentence boundaries.
           Default is False.
+        stanza_tokenize_interval (int): With the stanza tokenizer, runs stanza
+          only every this many characters or when a full sentence delimiter
+          arrives, extending the last sentence in between. Default is 1.
+        stanza_left_context (int): With the stanza tokenizer, the number of
+          characters of settled text passed to stanza in front of the part of
+          the buffer that is still undecided. Default is 200 characters.
+        on_yield (Callable[[YieldEvent], None]): Called with a YieldEvent
+          right before each sentence is yielded, for example to measure the
+          time to the first fragment. Default is None.
 
     Yields:
         Iterator[str]: An iterator of complete sentences constructed from the
@@ -477,6 +1046,9 @@ async def generate_sentences_async(
         quick_yield_every_fragment=quick_yield_every_fragment,
         auto_context=auto_context,
         never_split_numbers=never_split_numbers,
+        stanza_tokenize_interval=stanza_tokenize_interval,
+        stanza_left_context=stanza_left_context,
+        on_yield=on_yield,
         cleanup_text_links=cleanup_text_links,
         cleanup_text_emojis=cleanup_text_emojis,
         tokenize_sentences=tokenize_sentences,
@@ -505,45 +1077,211 @@ async def generate_sentences_async(
         yield sentence
 
 
-def _await_sync(f: Awaitable[str]) -> str:
-    gen = f.__await__()
-    try:
-        next(gen)
-        raise RuntimeError(f"{f} failed to be synchronous")
-    except StopIteration as e:
-        return e.value
+def _generate_sentences(generator: Iterable[str], options: dict) -> Iterator[str]:
+    sentence_splitter = SentenceSplitter(**options)
+    log_characters = options["log_characters"]
 
+    if log_characters:
+        print("Stream: ", end="", flush=True)
 
-def _async_iter_to_sync(f: AsyncIterator[str]) -> Iterator[str]:
-    try:
-        while True:
-            yield _await_sync(f.__anext__())
-    except StopAsyncIteration:
-        return
+    for chunk in generator:
+        sentence_splitter.add(chunk)
+        yield from sentence_splitter.stream()
 
+    if log_characters:
+        print()
 
-P = ParamSpec("P")
+    yield from sentence_splitter.flush()
 
 
-def _dowrap(
-    f: Callable[Concatenate[AsyncIterable[str], P], AsyncIterator[str]]
-) -> Callable[Concatenate[Iterable[str], P], Iterator[str]]:
-    @functools.wraps(f)
-    def inner(generator: Iterable[str], *args: P.args, **kwargs: P.kwargs):
-        async def gen_wrap():
-            for x in generator:
-                yield x
+def _sync_variant(f: Callable[..., AsyncIterator[str]]) -> Callable[..., Iterator[str]]:
+    """
+    Builds the synchronous counterpart of an async sentence generator. It
+    takes the same arguments and drives the same SentenceSplitter directly,
+    without running the async generator.
+    """
+
+    @functools.cache
+    def signature():
+        # inspect is slow to import, so it is only loaded on the first call
+        import inspect
 
-        return _async_iter_to_sync(f(gen_wrap(), *args, **kwargs))
+        return inspect.signature(f)
+
+    @functools.wraps(f)
+    def inner(generator: Iterable[str], *args, **kwargs) -> Iterator[str]:
+        arguments = signature().bind(generator, *args, **kwargs)
+        arguments.apply_defaults()
+        options = dict(arguments.arguments)
+        del options["generator"]
+        return _generate_sentences(generator, options)
 
     return inner
 
 
-generate_sentences = _dowrap(generate_sentences_async)
+generate_sentences = _sync_variant(generate_sentences_async)
 generate_sentences.__name__ = "generate_sentences"
 generate_sentences.__qualname__ = "generate_sentences"
 
 
+_batch_worker_state = None
+
+
+def _split_document(text: str, options: dict, return_offsets: bool = False):
+    if return_offsets:
+        if options["tokenize_sentences"] is None:
+            spans = _tokenize_sentence_spans(
+                text,
+                options["tokenizer"],
+                options["language"],
+                options["never_split_numbers"],
+            )
+        else:
+            spans = _spans_of_sentences(text, options["tokenize_sentences"](text))
+        return _spans_from_boundary_offsets(
+            text,
+            _boundary_offsets_from_spans(text, spans),
+        )
+
+    sentences = _tokenize_sentences(
+        text,
+        options["tokenize_sentences"],
+        options["tokenizer"],
+        options["language"],
+        options["never_split_numbers"],
+    )
+
+    sentences = (
+        _clean_text(
+            sentence,
+            options["cleanup_text_links"],
+            options["cleanup_text_emojis"],
+        )
+        for sentence in sentences
+    )
+    return [sentence for sentence in sentences if sentence]
+
+
+def _init_batch_worker(options: dict, return_offsets: bool):
+    global _batch_worker_state
+    if options["tokenize_sentences"] is None:
+        _initialize_tokenizer(options["tokenizer"], options["language"])
+    get_boundary_detector(options["language"], options["never_split_numbers"])
+    _batch_worker_state = (options, return_offsets)
+
+
+def _split_indexed_document(item: tuple[int, str]) -> tuple[int, list]:
+    index, text = item
+    return index, _split_document(text, *_batch_worker_state)
+
+
+class _SentenceBuffer:
+    """
+    Character buffer with amortized O(1) appends.
+
+    Appended characters are collected in a list and joined into the text view
+    only when it is read, so characters that never reach the boundary detector
+    or tokenizer do not copy the whole buffer. The text view is cached and
+    shared by all readers until the next mutation. The brackets and urls
+    trackers follow every mutation so the boundary detector can classify
+    closing brackets and delimiters inside URLs without scanning the buffer.
+    """
+
+    __slots__ = ("_text", "_pending", "_length", "_last", "brackets", "urls")
+
+    def __init__(self, text: str = ""):
+        self.brackets = BracketTracker()
+        self.urls = UrlTracker()
+        self.reset(text)
+
+    def reset(self, text: str = ""):
+        self._text = text
+        self._pending = []
+        self._length = len(text)
+        self._last = text[-1:]
+        self.brackets.reset(text)
+        self.urls.reset(text)
+
+    def __len__(self) -> int:
+        return self._length
+
+    @property
+    def last(self) -> str:
+        return self._last
+
+    @property
+    def text(self) -> str:
+        if self._pending:
+            self._pending.insert(0, self._text)
+            self._text = "".join(self._pending)
+            self._pending = []
+        return self._text
+
+    def append(self, char: str):
+        """
+        Appends a character, dropping leading whitespace like
+        `(buffer + char).lstrip()` would.
+        """
+        if self._length == 0 or self._text[:1].isspace():
+            self.reset((self.text + char).lstrip())
+            return
+
+        self._pending.append(char)
+        self.brackets.append(char, self._length)
+        self.urls.append(char, self._length)
+        self._length += len(char)
+        self._last = char[-1]
+
+    def consume(self, end: Optional[int] = None) -> str:
+        """
+        Removes and returns the first `end` characters (all if None) and drops
+        the whitespace that follows them.
+        """
+        text = self.text
+        if end is None:
+            self.reset()
+            return text
+
+        remainder = text[end:].lstrip()
+        self._text = remainder
+        self._length = len(remainder)
+        self._last = remainder[-1:]
+        self.brackets.consume(len(text) - len(remainder))
+        self.urls.consume(len(text) - len(remainder))
+        return text[:end]
+
+
+class YieldEvent(NamedTuple):
+    """
+    Describes a sentence or fragment right before it is yielded.
+
+    reason tells which rule released the text:
+      - "quick_yield": a sentence fragment delimiter the boundary detector
+        split at right away
+      - "quick_yield_after_hold": a fragment delimiter the boundary detector
+        held until the following characters confirmed it
+      - "forced_after_words": force_first_fragment_after_words was reached
+      - "context_window": a sentence boundary left the context window
+      - "auto_context": auto_context yielded a sentence before the full
+        context window arrived
+      - "flush": the remaining text at the end of the stream
+
+    generate_sentences_time_based reports "deadline", "sentences_ahead" and
+    "flush" instead, with times read from its clock.
+
+    time and first_char_time are time.monotonic() values; first_char_time is
+    when the first non-empty chunk was added, so the time to the first
+    fragment is time - first_char_time of the event with index 0.
+    """
+
+    text: str
+    reason: str
+    buffer_length: int
+    time: float
+    first_char_time: Optional[float]
+    index: int
+
+
 class SentenceSplitter:
     def __init__(
         self,
@@ -567,6 +1305,9 @@ class SentenceSplitter:
         debug=False,
         auto_context: bool = False,
         never_split_numbers: bool = False,
+        stanza_tokenize_interval: int = 1,
+        stanza_left_context: int = 200,
+        on_yield: Optional[Callable[["YieldEvent"], None]] = None,
     ):
         """
         Generates well-formed sentences from a stream of characters or text chunks
@@ -630,6 +1371,16 @@ class SentenceSplitter:
             never_split_numbers (bool): If True, bare integer tokens ending in a
             period, such as "1.", are treated as non-sentence boundaries.
             Default is False.
+            stanza_tokenize_interval (int): With the stanza tokenizer, runs
+            stanza only every this many characters or when a full sentence
+            delimiter arrives, extending the last sentence in between.
+            Default is 1.
+            stanza_left_context (int): With the stanza tokenizer, the number of
+            characters of settled text passed to stanza in front of the part of
+            the buffer that is still undecided. Default is 200 characters.
+            on_yield (Callable[[YieldEvent], None]): Called with a YieldEvent
+            right before each sentence is yielded, for example to measure the
+            time to the first fragment. Default is None.
 
         Yields:
             Iterator[str]: An iterator of complete sentences constructed from the
@@ -644,12 +1395,11 @@ class SentenceSplitter:
         making it versatile for different types of text processing applications.
         """
 
-        global current_tokenizer
-        current_tokenizer = _normalize_tokenizer(tokenizer)
-        init_tokenizer(current_tokenizer, language, debug=debug)
+        tokenizer = _normalize_tokenizer(tokenizer)
+        _initialize_tokenizer(tokenizer, language, debug=debug)
 
         self.input_buffer = collections.deque[str]()
-        self.buffer = ""
+        self._buffer = _SentenceBuffer()
         self.is_first_sentence = True
         self.word_count = 0  # Initialize word count
         self.last_delimiter_position = -1  # Position of last full sentence delimiter
@@ -674,39 +1424,91 @@ class SentenceSplitter:
         self.cleanup_text_links = cleanup_text_links
         self.cleanup_text_emojis = cleanup_text_emojis
         self.tokenize_sentences = tokenize_sentences
-        self.tokenizer = current_tokenizer
+        self.tokenizer = tokenizer
         self.language = language
         self.quick_yield_boundary_detector = get_boundary_detector(
             language,
             never_split_numbers,
         )
+        self.rule_based_tokenizer = _IncrementalRuleBasedTokenizer(
+            language,
+            never_split_numbers,
+        )
+        if self.tokenizer == "stanza":
+            self.sentence_cache = _StableSentenceCache(
+                stanza_left_context,
+                stanza_tokenize_interval,
+                full_sentence_delimiters,
+            )
+        else:
+            self.sentence_cache = _StableSentenceCache()
+        self.punkt_decisions = _PunktDecisionCache()
         self.log_characters = log_characters
         self.sentence_fragment_delimiters = sentence_fragment_delimiters
         self.full_sentence_delimiters = full_sentence_delimiters
         self.force_first_fragment_after_words = force_first_fragment_after_words
         self.filter_first_non_alnum_characters = filter_first_non_alnum_characters
         self.debug = debug
+        self.on_yield = on_yield
+        self._first_char_time = None
+        self._yield_count = 0
+
+        # Runs of characters that can never start a split or fragment yield
+        special_characters = re.escape(
+            "".join(
+                sorted(
+                    set(sentence_fragment_delimiters)
+                    | set(full_sentence_delimiters)
+                    | _SENTENCE_TERMINATORS
+                )
+            )
+        )
+        self._plain_run_pattern = re.compile(rf"[^\s{special_characters}]+")
+        self._plain_run_with_spaces_pattern = re.compile(rf"[^{special_characters}]+")
+
+    @property
+    def buffer(self) -> str:
+        return self._buffer.text
+
+    @buffer.setter
+    def buffer(self, text: str):
+        self._buffer.reset(text)
 
     def add(self, chunk: str):
+        if self.on_yield is not None and self._first_char_time is None and chunk:
+            self._first_char_time = time.monotonic()
         self.input_buffer.append(chunk)
 
+    def _report_yield(self, text, reason, buffer_length):
+        self.on_yield(
+            YieldEvent(
+                text,
+                reason,
+                buffer_length,
+                time.monotonic(),
+                self._first_char_time,
+                self._yield_count,
+            )
+        )
+        self._yield_count += 1
+
     def _quick_yield_boundary_end(self, boundary_position):
         boundary_end = boundary_position
         if self._is_quick_yield_terminal(boundary_position):
             while (
-                boundary_end + 1 < len(self.buffer)
+                boundary_end + 1 < len(self._buffer)
                 and self.buffer[boundary_end + 1] in _QUICK_YIELD_TERMINATORS
             ):
                 boundary_end += 1
         while (
-            boundary_end + 1 < len(self.buffer)
+            boundary_end + 1 < len(self._buffer)
             and self.buffer[boundary_end + 1] in _QUICK_YIELD_CLOSING_MARKS
         ):
             boundary_end += 1
         return boundary_end
 
     def _has_quick_yield_lookahead(self, boundary_position):
-        return self._quick_yield_boundary_end(boundary_position) < len(self.buffer) - 1
+        return self._quick_yield_boundary_end(boundary_position) < len(self._buffer) - 1
 
     def _is_quick_yield_terminal(self, boundary_position):
         return self.buffer[boundary_position] in _QUICK_YIELD_TERMINATORS
@@ -724,263 +1526,506 @@ class SentenceSplitter:
             return None
 
         next_char = self.buffer[boundary_end + 1]
-        action = self.quick_yield_boundary_detector.classify(
+        action = self.quick_yield_boundary_detector.classify_at(
             self.buffer,
             boundary_position,
-            next_char,
+            next_char=next_char,
+            brackets=self._buffer.brackets,
+            urls=self._buffer.urls,
         )
         if action != SPLIT:
             return None
 
         return boundary_end + 1
 
-    def _auto_context_matches_tokenizer(self, sentences, boundary_offset):
+    def _auto_context_matches_tokenizer(self, text, spans, groups, boundary_offset):
+        if len(groups) < 2:
+            return False
+
+        if self.tokenize_sentences is None and groups[0][0] == groups[0][1]:
+            start, end = _stripped_span(text, spans[0], spans[1])
+            if end > start:
+                return end == boundary_offset
+
+        sentences = [self._combined_sentence(text, spans, group) for group in groups]
         offsets = _sentence_boundary_offsets(self.buffer, sentences)
         return bool(offsets) and offsets[0] == boundary_offset
 
-    def _consume_quick_yield_text(self, boundary_position=None):
+    def _consume_quick_yield_text(self, boundary_position=None, reason="quick_yield"):
+        buffer_length = len(self._buffer)
         if boundary_position is None:
-            text = self.buffer
-            self.buffer = ""
+            text = self._buffer.consume()
         else:
-            text = self.buffer[:boundary_position + 1]
-            self.buffer = self.buffer[boundary_position + 1:].lstrip()
+            text = self._buffer.consume(boundary_position + 1)
 
         self.word_count = 0
         self.pending_quick_yield_boundary = None
         if not self.quick_yield_every_fragment:
             self.is_first_sentence = False
 
-        return _clean_text(text, self.cleanup_text_links, self.cleanup_text_emojis)
+        text = _clean_text(text, self.cleanup_text_links, self.cleanup_text_emojis)
+        if self.on_yield is not None:
+            self._report_yield(text, reason, buffer_length)
+        return text
+
+    def _tokenize_buffer(self):
+        """
+        Returns the sentence spans of the buffer together with the text they
+        point into. Sentences from a custom tokenize_sentences are not
+        necessarily part of the buffer, so they are laid out back to back in
+        a text of their own.
+        """
+        if self.tokenize_sentences is None:
+            text = self.buffer
+            return text, _tokenize_sentence_spans(
+                text,
+                self.tokenizer,
+                self.language,
+                self.never_split_numbers,
+                self.rule_based_tokenizer,
+                self.sentence_cache,
+                self.punkt_decisions,
+            )
+
+        sentences = self.tokenize_sentences(self.buffer)
+        spans = array("I")
+        end = 0
+        for sentence in sentences:
+            spans.append(end)
+            end += len(sentence)
+            spans.append(end)
+        return "".join(sentences), spans
+
+    def _combine_short_spans(self, spans):
+        """
+        Groups sentences below minimum_sentence_length with the next
+        sentence(s) and returns the first and last span index of each group.
+        """
+        groups = []
+        group_start = None
+
+        for index in range(len(spans) // 2):
+            if spans[2 * index + 1] - spans[2 * index] < self.minimum_sentence_length:
+                if group_start is None:
+                    group_start = index
+            else:
+                groups.append((index if group_start is None else group_start, index))
+                group_start = None
+
+        # If there's a leftover group that hasn't been closed
+        if group_start is not None:
+            groups.append((group_start, len(spans) // 2 - 1))
+
+        return groups
+
+    def _combined_sentence(self, text, spans, group):
+        first, last = group
+        return " ".join(
+            text[spans[2 * index]:spans[2 * index + 1]]
+            for index in range(first, last + 1)
+        ).strip()
+
+    def _plain_run_end(self, chunk, index):
+        """
+        Returns the end of the run of characters starting at chunk[index] that
+        can be appended in one step without changing what stream() yields, or
+        index if the next character needs the per-character checks.
+
+        A plain run holds no delimiters or sentence terminators, and whitespace
+        only while no first fragment quick yield is pending. Before the context
+        is ready such characters only accumulate. Once it is ready, the run must
+        leave every rule-based boundary settled, so only the last sentence grows
+        and the only possible yield comes from the last delimiter entering the
+        context window, whose position is known in advance.
+        """
+        if (
+            self.debug
+            or self.pending_quick_yield_boundary is not None
+            or len(self._buffer) == 0
+        ):
+            return index
+
+        if self.is_first_sentence and self.quick_yield_single_sentence_fragment:
+            match = self._plain_run_pattern.match(chunk, index)
+        else:
+            match = self._plain_run_with_spaces_pattern.match(chunk, index)
+        if match is None:
+            return index
+
+        run_length = match.end() - index
+        buffer_length = len(self._buffer)
+        context_threshold = self.minimum_sentence_length + self.context_size
+
+        if buffer_length < context_threshold:
+            limit = context_threshold
+            if self.auto_context and self.last_delimiter_position >= 0:
+                limit = min(limit, self.minimum_sentence_length)
+            return index + max(0, min(run_length, limit - buffer_length))
+
+        if (
+            self.tokenize_sentences is not None
+            or self.tokenizer != "rule-based"
+            or (self.auto_context and self.last_delimiter_position >= 0)
+        ):
+            return index
+
+        text = self._buffer.text
+        if text[:1].isspace():
+            return index
+
+        spans = self.rule_based_tokenizer.tokenize_spans(text)
+        if not self.rule_based_tokenizer.settled:
+            return index
+
+        groups = self._combine_short_spans(spans)
+        if (
+            len(groups) < 2
+            or sum(
+                len(self._combined_sentence(text, spans, group))
+                for group in groups[:-1]
+            )
+            < self.minimum_sentence_length
+        ):
+            return index + run_length
+        if len(groups) > 2:
+            return index
+        if self.last_delimiter_position < 0:
+            return index + run_length
+
+        first_in_window = max(
+            1,
+            self.last_delimiter_position + self.context_size + 1 - buffer_length,
+        )
+        window_start = (
+            buffer_length + first_in_window - self.context_size - 1
+            - self.context_size_look_overhead
+        )
+        if window_start > self.last_delimiter_position:
+            return index + run_length
+
+        return index + min(run_length, first_in_window - 1)
 
     def stream(self):
         while self.input_buffer:
             chunk = self.input_buffer.popleft()
-            for char in _generate_characters_from_chunk(chunk, self.log_characters):
-                if char:
-                    if len(self.buffer) == 0:
-                        if self.filter_first_non_alnum_characters:
-                            if not char.isalnum():
-                                continue
-
-                    self.buffer = (self.buffer + char).lstrip()
-
-                    if self.pending_quick_yield_boundary is not None:
-                        boundary_position = self.pending_quick_yield_boundary
-                        boundary_end = self._quick_yield_boundary_end(boundary_position)
-                        if self._is_quick_yield_terminal(boundary_position):
-                            if not self._has_quick_yield_lookahead(boundary_position):
-                                continue
-                            next_char = self.buffer[boundary_end + 1]
-                        elif boundary_position < len(self.buffer) - 1:
-                            next_char = self.buffer[boundary_position + 1]
-                        else:
-                            continue
+            index = 0
+            while index < len(chunk):
+                run_end = self._plain_run_end(chunk, index)
+                if run_end > index:
+                    run = chunk[index:run_end]
+                    index = run_end
+                    if self.log_characters:
+                        print(run, end="", flush=True)
+                    self._buffer.append(run)
+                    self.word_count += sum(map(str.isspace, run))
+                    continue
 
-                        if (
-                            self._is_quick_yield_pre_terminal_closing_mark(boundary_position)
-                            and next_char in _QUICK_YIELD_TERMINATORS
-                        ):
-                            self.pending_quick_yield_boundary = None
-                        elif boundary_position < len(self.buffer) - 1:
-                            action = self.quick_yield_boundary_detector.classify(
-                                self.buffer,
-                                boundary_position,
-                                next_char,
-                            )
-                            if action != HOLD:
-                                self.pending_quick_yield_boundary = None
-                            if action == SPLIT:
-                                yield_text = self._consume_quick_yield_text(boundary_end)
-                                if self.debug:
-                                    print("\033[36mDebug: Yielding first sentence fragment: \"{}\" after confirming pending delimiter\033[0m".format(yield_text))
-                                yield yield_text
-                                continue
+                char = chunk[index]
+                index += 1
+                if self.log_characters:
+                    print(char, end="", flush=True)
 
-                    # Update word count on encountering space or sentence fragment delimiter
-                    if char.isspace() or char in self.sentence_fragment_delimiters:
-                        self.word_count += 1
+                if len(self._buffer) == 0:
+                    if self.filter_first_non_alnum_characters:
+                        if not char.isalnum():
+                            continue
 
-                    if self.debug:
-                        print("\033[36mDebug: Added char, buffer size: \"{}\"\033[0m".format(len(self.buffer)))
+                self._buffer.append(char)
+
+                if self.pending_quick_yield_boundary is not None:
+                    boundary_position = self.pending_quick_yield_boundary
+                    boundary_end = self._quick_yield_boundary_end(boundary_position)
+                    if self._is_quick_yield_terminal(boundary_position):
+                        if not self._has_quick_yield_lookahead(boundary_position):
+                            continue
+                        next_char = self.buffer[boundary_end + 1]
+                    elif boundary_position < len(self._buffer) - 1:
+                        next_char = self.buffer[boundary_position + 1]
+                    else:
+                        continue
 
-                    # Check conditions to yield first sentence fragment quickly
                     if (
-                        self.is_first_sentence
-                        and len(self.buffer) > self.minimum_first_fragment_length
-                        and self.quick_yield_single_sentence_fragment
+                        self._is_quick_yield_pre_terminal_closing_mark(boundary_position)
+                        and next_char in _QUICK_YIELD_TERMINATORS
                     ):
-
-                        if self.buffer[-1] in self.sentence_fragment_delimiters:
-                            boundary_position = len(self.buffer) - 1
-                            action = self.quick_yield_boundary_detector.classify(
-                                self.buffer,
-                                boundary_position,
+                        self.pending_quick_yield_boundary = None
+                    elif boundary_position < len(self._buffer) - 1:
+                        action = self.quick_yield_boundary_detector.classify_at(
+                            self.buffer,
+                            boundary_position,
+                            next_char=next_char,
+                            brackets=self._buffer.brackets,
+                            urls=self._buffer.urls,
+                        )
+                        if action != HOLD:
+                            self.pending_quick_yield_boundary = None
+                        if action == SPLIT:
+                            yield_text = self._consume_quick_yield_text(
+                                boundary_end, "quick_yield_after_hold"
                             )
-                            if action == HOLD:
-                                self.pending_quick_yield_boundary = boundary_position
-                                continue
-                            if action == REJECT:
-                                continue
-                            if self._is_quick_yield_terminal(boundary_position):
-                                self.pending_quick_yield_boundary = boundary_position
-                                continue
-                            if self._is_quick_yield_pre_terminal_closing_mark(boundary_position):
-                                self.pending_quick_yield_boundary = boundary_position
-                                continue
-
-                            yield_text = self._consume_quick_yield_text()
                             if self.debug:
-                                print("\033[36mDebug: Yielding first sentence fragment: \"{}\" because buffer[-1] is sentence frag \033[0m".format(yield_text))
-
+                                print("\033[36mDebug: Yielding first sentence fragment: \"{}\" after confirming pending delimiter\033[0m".format(yield_text))
                             yield yield_text
+                            continue
+
+                # Update word count on encountering space or sentence fragment delimiter
+                if char.isspace() or char in self.sentence_fragment_delimiters:
+                    self.word_count += 1
 
+                if self.debug:
+                    print("\033[36mDebug: Added char, buffer size: \"{}\"\033[0m".format(len(self._buffer)))
+
+                # Check conditions to yield first sentence fragment quickly
+                if (
+                    self.is_first_sentence
+                    and len(self._buffer) > self.minimum_first_fragment_length
+                    and self.quick_yield_single_sentence_fragment
+                ):
+
+                    if self._buffer.last in self.sentence_fragment_delimiters:
+                        boundary_position = len(self._buffer) - 1
+                        action = self.quick_yield_boundary_detector.classify_at(
+                            self.buffer,
+                            boundary_position,
+                            brackets=self._buffer.brackets,
+                            urls=self._buffer.urls,
+                        )
+                        if action == HOLD:
+                            self.pending_quick_yield_boundary = boundary_position
+                            continue
+                        if action == REJECT:
+                            continue
+                        if self._is_quick_yield_terminal(boundary_position):
+                            self.pending_quick_yield_boundary = boundary_position
+                            continue
+                        if self._is_quick_yield_pre_terminal_closing_mark(boundary_position):
+                            self.pending_quick_yield_boundary = boundary_position
                             continue
 
-                        if char.isspace() and self.word_count >= self.force_first_fragment_after_words:
-                            word_count = self.word_count
-                            yield_text = self._consume_quick_yield_text()
-                            if self.debug:
-                                print("\033[36mDebug: Yielding first sentence fragment: \"{}\" because word_count {} is >= force_first_fragment_after_words \033[0m".format(yield_text, word_count))
+                        yield_text = self._consume_quick_yield_text()
+                        if self.debug:
+                            print("\033[36mDebug: Yielding first sentence fragment: \"{}\" because buffer[-1] is sentence frag \033[0m".format(yield_text))
 
-                            yield yield_text
+                        yield yield_text
 
-                            continue
+                        continue
 
-                    if self.auto_context and char in self.full_sentence_delimiters:
-                        self.last_delimiter_position = len(self.buffer) - 1
+                    if char.isspace() and self.word_count >= self.force_first_fragment_after_words:
+                        word_count = self.word_count
+                        yield_text = self._consume_quick_yield_text(
+                            reason="forced_after_words"
+                        )
+                        if self.debug:
+                            print("\033[36mDebug: Yielding first sentence fragment: \"{}\" because word_count {} is >= force_first_fragment_after_words \033[0m".format(yield_text, word_count))
 
-                    context_ready = (
-                        len(self.buffer) > self.minimum_sentence_length + self.context_size
-                    )
+                        yield yield_text
 
-                    # Continue accumulating characters if buffer is under minimum sentence length
-                    if not context_ready:
-                        if (
-                            not self.auto_context
-                            or self.last_delimiter_position < 0
-                            or len(self.buffer) <= self.minimum_sentence_length
-                        ):
-                            continue
+                        continue
+
+                if self.auto_context and char in self.full_sentence_delimiters:
+                    self.last_delimiter_position = len(self._buffer) - 1
 
-                    elif char in self.full_sentence_delimiters:
-                        self.last_delimiter_position = len(self.buffer) - 1
+                context_ready = (
+                    len(self._buffer) > self.minimum_sentence_length + self.context_size
+                )
 
-                    auto_context_boundary_offset = self._auto_context_boundary_offset()
-                    if not context_ready and auto_context_boundary_offset is None:
+                # Continue accumulating characters if buffer is under minimum sentence length
+                if not context_ready:
+                    if (
+                        not self.auto_context
+                        or self.last_delimiter_position < 0
+                        or len(self._buffer) <= self.minimum_sentence_length
+                    ):
                         continue
 
-                    # Define context window for checking potential sentence boundaries
-                    context_window_end_pos = len(self.buffer) - self.context_size - 1
-                    context_window_start_pos = (
-                        context_window_end_pos - self.context_size_look_overhead
-                    )
-                    if context_window_start_pos < 0:
-                        context_window_start_pos = 0
-
-                    # Tokenize sentences from buffer
-                    sentences = _tokenize_sentences(
-                        self.buffer,
-                        self.tokenize_sentences,
-                        self.tokenizer,
-                        self.language,
-                        self.never_split_numbers,
-                    )
+                elif char in self.full_sentence_delimiters:
+                    self.last_delimiter_position = len(self._buffer) - 1
+
+                auto_context_boundary_offset = self._auto_context_boundary_offset()
+                if not context_ready and auto_context_boundary_offset is None:
+                    continue
+
+                # Define context window for checking potential sentence boundaries
+                context_window_end_pos = len(self._buffer) - self.context_size - 1
+                context_window_start_pos = (
+                    context_window_end_pos - self.context_size_look_overhead
+                )
+                if context_window_start_pos < 0:
+                    context_window_start_pos = 0
+
+                # Tokenize sentences from buffer
+                text, spans = self._tokenize_buffer()
+
+                # Combine sentences below minimum_sentence_length with the next sentence(s)
+                groups = self._combine_short_spans(spans)
 
-                    if self.debug:
-                        print("\033[36mbuffer: \"{}\"\033[0m".format(self.buffer))
-                        print("\033[36mlast_delimiter_position: {}\033[0m".format(self.last_delimiter_position))
-                        print("\033[36mlen(sentences) > 2: {}\033[0m".format(len(sentences) > 2))
-                        print("\033[36mcontext_window_start_pos: {}\033[0m".format(context_window_start_pos))
-                        print("\033[36mcontext_window_end_pos: {}\033[0m".format(context_window_end_pos))
-
-                    # Combine sentences below minimum_sentence_length with the next sentence(s)
-                    combined_sentences = []
-                    temp_sentence = ""
-
-                    for sentence in sentences:
-                        if len(sentence) < self.minimum_sentence_length:
-                            temp_sentence += sentence + " "
-                        else:
-                            if temp_sentence:
-                                temp_sentence += sentence
-                                combined_sentences.append(temp_sentence.strip())
-                                temp_sentence = ""
-                            else:
-                                combined_sentences.append(sentence.strip())
-
-                    # If there's a leftover temp_sentence that hasn't been appended
-                    if temp_sentence:
-                        combined_sentences.append(temp_sentence.strip())
-
-                    # Replace the original sentences with the combined_sentences
-                    sentences = combined_sentences
-
-                    # Process and yield sentences based on conditions
-                    auto_context_ready = (
-                        auto_context_boundary_offset is not None
-                        and self._auto_context_matches_tokenizer(
-                            sentences,
-                            auto_context_boundary_offset,
+                if self.debug:
+                    print("\033[36mbuffer: \"{}\"\033[0m".format(self.buffer))
+                    print("\033[36mlast_delimiter_position: {}\033[0m".format(self.last_delimiter_position))
+                    print("\033[36mlen(sentences) > 2: {}\033[0m".format(len(groups) > 2))
+                    print("\033[36mcontext_window_start_pos: {}\033[0m".format(context_window_start_pos))
+                    print("\033[36mcontext_window_end_pos: {}\033[0m".format(context_window_end_pos))
+
+                # Process and yield sentences based on conditions
+                auto_context_ready = (
+                    auto_context_boundary_offset is not None
+                    and self._auto_context_matches_tokenizer(
+                        text,
+                        spans,
+                        groups,
+                        auto_context_boundary_offset,
+                    )
+                )
+                if auto_context_ready or (
+                    context_ready
+                    and (
+                        len(groups) > 2
+                        or (
+                            self.last_delimiter_position >= 0
+                            and context_window_start_pos
+                            <= self.last_delimiter_position
+                            <= context_window_end_pos
                         )
                     )
-                    if auto_context_ready or (
-                        context_ready
-                        and (
-                            len(sentences) > 2
-                            or (
-                                self.last_delimiter_position >= 0
-                                and context_window_start_pos
-                                <= self.last_delimiter_position
-                                <= context_window_end_pos
-                            )
+                ):
+
+                    if len(groups) > 1:
+                        sentences = [
+                            self._combined_sentence(text, spans, group)
+                            for group in groups
+                        ]
+                        total_length_except_last = sum(
+                            len(sentence) for sentence in sentences[:-1]
                         )
-                    ):
+                        if total_length_except_last >= self.minimum_sentence_length:
+                            for sentence in sentences[:-1]:
+                                yield_text = _clean_text(
+                                    sentence,
+                                    self.cleanup_text_links,
+                                    self.cleanup_text_emojis)
+                                if self.debug:
+                                    print("\033[36mDebug: Yielding sentence: \"{}\"\033[0m".format(yield_text))
+                                if self.on_yield is not None:
+                                    self._report_yield(
+                                        yield_text,
+                                        "auto_context" if auto_context_ready else "context_window",
+                                        len(self._buffer),
+                                    )
 
-                        if len(sentences) > 1:
-                            total_length_except_last = sum(
-                                len(sentence) for sentence in sentences[:-1]
-                            )
-                            if total_length_except_last >= self.minimum_sentence_length:
-                                for sentence in sentences[:-1]:
-                                    yield_text = _clean_text(
-                                        sentence,
-                                        self.cleanup_text_links,
-                                        self.cleanup_text_emojis)
-                                    if self.debug:
-                                        print("\033[36mDebug: Yielding sentence: \"{}\"\033[0m".format(yield_text))
+                                yield yield_text
+                                self.word_count = 0
+
+                            if self.quick_yield_for_all_sentences:
+                                self.is_first_sentence = True
 
-                                    yield yield_text
-                                    self.word_count = 0
+                            # we need to remember if the buffer ends with space
+                            # - sentences returned by the tokenizers are rtrimmed
+                            # - this takes any blank spaces away from the last unfinshed sentence
+                            # - we have to work around this by re-adding the blank space in this case
+                            ends_with_space = self._buffer.last == " "
 
-                                if self.quick_yield_for_all_sentences:
-                                    self.is_first_sentence = True
+                            # set buffer to last unfinshed sentence returned by tokenizers
+                            # and reset the blank space if it was there
+                            self._buffer.reset(
+                                sentences[-1] + " " if ends_with_space else sentences[-1]
+                            )
 
-                                # we need to remember if the buffer ends with space
-                                # - sentences returned by the tokenizers are rtrimmed
-                                # - this takes any blank spaces away from the last unfinshed sentence
-                                # - we have to work around this by re-adding the blank space in this case
-                                ends_with_space = self.buffer.endswith(" ")
+                            # reset the last delimiter position after yielding
+                            self.last_delimiter_position = -1 
+
+    def split_many(
+        self,
+        texts: Iterable[str],
+        processes: Optional[int] = None,
+        chunksize: int = 64,
+        ordered: bool = True,
+        return_offsets: bool = False,
+    ) -> Iterator:
+        """
+        Splits finished documents into sentences using a process pool.
 
-                                # set buffer to last unfinshed sentence returned by tokenizers
-                                self.buffer = sentences[-1]
+        Uses the tokenizer, language, never_split_numbers, tokenize_sentences
+        and cleanup settings of this splitter; the streaming settings do not
+        apply to whole documents. Each worker loads the tokenizer and warms
+        the boundary detector cache once. A custom tokenize_sentences must be
+        picklable to be sent to the workers.
 
-                                # reset the blank space if it was there:
-                                if ends_with_space:
-                                    self.buffer += " "
+        Args:
+            texts (Iterable[str]): The documents to split.
+            processes (int, optional): Number of worker processes. None uses
+              the CPU count once the documents add up to 1 MiB of text and
+              splits smaller batches in the calling process. 1 or less
+              always splits in the calling process.
+            chunksize (int): Number of documents sent to a worker at once.
+            ordered (bool): If True, results follow the order of texts.
+              Otherwise (index, result) pairs are yielded as they complete.
+            return_offsets (bool): If True, each result is an array('I') of
+              the start and end offset of each sentence in the document,
+              flattened, instead of the sentences.
 
-                                # reset the last delimiter position after yielding
-                                self.last_delimiter_position = -1 
+        Yields:
+            list or array: With ordered=True, the sentences or sentence
+              offsets of each document in the order of texts.
+            tuple: With ordered=False, (index, result) pairs where index is
+              the position of the document in texts. This holds for every
+              value of processes.
+        """
+        options = {
+            "tokenize_sentences": self.tokenize_sentences,
+            "tokenizer": self.tokenizer,
+            "language": self.language,
+            "never_split_numbers": self.never_split_numbers,
+            "cleanup_text_links": self.cleanup_text_links,
+            "cleanup_text_emojis": self.cleanup_text_emojis,
+        }
+        if processes is None:
+            texts = iter(texts)
+            head = []
+            length = 0
+            for text in texts:
+                head.append(text)
+                length += len(text)
+                if length >= _SPLIT_MANY_POOL_MIN_CHARACTERS:
+                    break
+            texts = itertools.chain(head, texts)
+            processes = (os.cpu_count() or 1) if length >= _SPLIT_MANY_POOL_MIN_CHARACTERS else 1
+
+        if processes <= 1:
+            for index, text in enumerate(texts):
+                result = _split_document(text, options, return_offsets)
+                yield result if ordered else (index, result)
+            return
+
+        import multiprocessing
+
+        with multiprocessing.Pool(
+            processes,
+            initializer=_init_batch_worker,
+            initargs=(options, return_offsets),
+        ) as pool:
+            if ordered:
+                for _, result in pool.imap(
+                    _split_indexed_document, enumerate(texts), chunksize
+                ):
+                    yield result
+            else:
+                yield from pool.imap_unordered(
+                    _split_indexed_document, enumerate(texts), chunksize
+                )
 
     def flush(self):
         # Yield remaining buffer as final sentence(s)
-        if self.buffer:
+        if len(self._buffer):
+            self.sentence_cache.expire()
             sentences = _tokenize_sentences(
                 self.buffer,
                 self.tokenize_sentences,
                 self.tokenizer,
                 self.language,
                 self.never_split_numbers,
+                self.rule_based_tokenizer,
+                self.sentence_cache,
+                self.punkt_decisions,
             )
             sentence_buffer = ""
 
@@ -997,6 +2042,8 @@ class SentenceSplitter:
 
                 if self.debug:
                     print("\033[36mDebug: Yielding final sentence(s): \"{}\"\033[0m".format(yield_text))
+                if self.on_yield is not None:
+                    self._report_yield(yield_text, "flush", len(self._buffer))
 
                 yield yield_text
 
@@ -1009,5 +2056,7 @@ class SentenceSplitter:
                     self.cleanup_text_emojis)
                 if self.debug:
                     print("\033[36mDebug: Yielding remaining text: \"{}\"\033[0m".format(yield_text))
+                if self.on_yield is not None:
+                    self._report_yield(yield_text, "flush", len(self._buffer))
 
                 yield yield_text
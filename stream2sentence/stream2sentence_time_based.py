@@ -1,20 +1,35 @@
 
+import collections
+import heapq
+import itertools
+import math
+import re
 import time
+import weakref
 from itertools import accumulate
 
 from stream2sentence.avoid_pause_words import AVOID_PAUSE_WORDS
 from stream2sentence.delimiter_ignore_prefixes import DELIMITER_IGNORE_PREFIXES
-from stream2sentence.stream2sentence import _tokenize_sentences
+from stream2sentence.stream2sentence import (
+    YieldEvent,
+    _sentences_from_spans,
+    _tokenize_sentence_spans,
+    _tokenize_sentences,
+)
 
 WORDS_PER_TOKEN = 0.75
+# Read by the module level helpers only, TimeBasedSentenceSplitter keeps its own settings
 preferred_sentence_fragment_delimiters_global = []
 sentence_fragment_delimiters_global = []
 delimiter_ignore_prefixes_global = []
+_WHITESPACE_PATTERN = re.compile(r"\s")
 
 def get_index_or_last(a_list, index):
     return a_list[index] if index < len(a_list) else a_list[-1]
 
-def find_last_delimiter(s, delimiters):
+def find_last_delimiter(s, delimiters, delimiter_ignore_prefixes=None):
+    if delimiter_ignore_prefixes is None:
+        delimiter_ignore_prefixes = delimiter_ignore_prefixes_global
     valid_indices = []
     for delimiter in delimiters:
         index = s.rfind(delimiter)
@@ -23,7 +38,7 @@ def find_last_delimiter(s, delimiters):
             preceding_word_start = s.rfind(" ", 0, index)
             preceding_word = s[preceding_word_start:index + 1].strip()
             
-            if preceding_word not in delimiter_ignore_prefixes_global:
+            if preceding_word not in delimiter_ignore_prefixes:
                 valid_indices.append(index)
     
     return max(valid_indices, default=-1)
@@ -34,6 +49,59 @@ def find_last_preferred_fragment_delimiter(s):
 def find_last_fragment_delimiter(s):
     return find_last_delimiter(s, sentence_fragment_delimiters_global)
 
+
+class _DelimiterScanner:
+    """
+    Finds the last delimiter of a growing text that does not follow one of
+    the ignore prefixes.
+
+    Like find_last_delimiter, only the last occurrence of each delimiter is a
+    candidate: if the word before it is ignored, that delimiter is skipped
+    rather than an earlier occurrence used. All delimiters are located with
+    one compiled pattern, and only the text appended since the previous call
+    is scanned, so the text passed to find_last() must extend the previous
+    one until reset() is called.
+    """
+
+    __slots__ = ("_delimiters", "_pattern", "_max_length", "_ignore_prefixes", "_last_indices", "_scanned")
+
+    def __init__(self, delimiters, ignore_prefixes):
+        self._delimiters = sorted(set(delimiters), key=len, reverse=True)
+        # A lookahead matches at every start position, so overlapping delimiters like "**" and "* " are all found
+        alternatives = "|".join(map(re.escape, self._delimiters))
+        self._pattern = re.compile(f"(?=(?:{alternatives}))") if self._delimiters else None
+        self._max_length = max(map(len, self._delimiters), default=0)
+        self._ignore_prefixes = ignore_prefixes
+        self.reset()
+
+    def reset(self):
+        self._last_indices = {}
+        self._scanned = 0
+
+    def find_last(self, s):
+        if self._pattern is None:
+            return -1
+        if len(s) < self._scanned:
+            self.reset()
+
+        # A delimiter ending in the new text may start up to max_length - 1 characters before it
+        start = max(0, self._scanned - self._max_length + 1)
+        last_indices = self._last_indices
+        for match in self._pattern.finditer(s, start):
+            index = match.start()
+            for delimiter in self._delimiters:
+                if s.startswith(delimiter, index):
+                    last_indices[delimiter] = index
+        self._scanned = len(s)
+
+        for index in sorted(last_indices.values(), reverse=True):
+            # Get the word preceding the delimiter
+            preceding_word_start = s.rfind(" ", 0, index)
+            preceding_word = s[preceding_word_start:index + 1].strip()
+            if preceding_word not in self._ignore_prefixes:
+                return index
+        return -1
+
 def get_num_words(s):
     return len(s.split())
 
@@ -44,15 +112,71 @@ def find_first_greater(nums, value):
     return -1
 
 
-def is_output_needed(has_output_started, start_time, lead_time, output_sentences, estimated_time_between_words, deadline_offset):
-    cur_time = time.time()
+class _WordOffsets:
+    """
+    Tracks the word boundaries of the LLM buffer as tokens are appended, so
+    the generator does not split the whole buffer again for every token.
+    """
+
+    __slots__ = ("first_whitespace", "last_space", "last_word_end")
+
+    def __init__(self, text=""):
+        self.reset(text)
+
+    def reset(self, text):
+        match = _WHITESPACE_PATTERN.search(text)
+        self.first_whitespace = match.start() if match else -1
+        self.last_space = text.rfind(" ")
+        self.last_word_end = len(text.rstrip())
+
+    def append(self, token, offset):
+        if self.first_whitespace < 0:
+            match = _WHITESPACE_PATTERN.search(token)
+            if match:
+                self.first_whitespace = offset + match.start()
+        index = token.rfind(" ")
+        if index != -1:
+            self.last_space = offset + index
+        word_end = len(token.rstrip())
+        if word_end:
+            self.last_word_end = offset + word_end
+
+    def has_two_words(self):
+        """Same as len(text.split(None, 2)) >= 2 for a left stripped text."""
+        return 0 <= self.first_whitespace < self.last_word_end
+
+    def without_last_word(self, text):
+        """Same as text.rsplit(" ", 1)[0]."""
+        return text[:self.last_space] if self.last_space != -1 else text
+
+
+def is_output_needed(has_output_started, start_time, lead_time, output_sentences, estimated_time_between_words, deadline_offset, cur_time=None):
+    if cur_time is None:
+        cur_time = time.time()
+    num_words_output = get_num_words(" ".join(output_sentences))
+    return _is_output_needed(has_output_started, start_time, lead_time, num_words_output, estimated_time_between_words, deadline_offset, cur_time)
+
+def _is_output_needed(has_output_started, start_time, lead_time, num_words_output, estimated_time_between_words, deadline_offset, cur_time):
     if not has_output_started and cur_time - start_time < lead_time:
         return False
     
-    num_words_output = get_num_words(" ".join(output_sentences))
     output_deadline = num_words_output * estimated_time_between_words - deadline_offset
     return cur_time - start_time > output_deadline
 
+def _first_time_after(start, duration):
+    """Returns a clock value t, the first one if possible, for which t - start > duration."""
+    t = start + duration
+    while not t - start > duration and math.isfinite(t):
+        t = math.nextafter(t, math.inf)
+    return t
+
+def _first_time_from(start, duration):
+    """Returns a clock value t, the first one if possible, for which t - start < duration is false."""
+    t = start + duration
+    while t - start < duration and math.isfinite(t):
+        t = math.nextafter(t, math.inf)
+    return t
+
 def is_output_long_enough(output, min_output_length):
     num_words = get_num_words(output)
     return (num_words >= min_output_length)
@@ -67,6 +191,17 @@ def get_fragment(llm_buffer, min_output_length):
         return llm_buffer[:delimiter_index + 1]
     return ""
 
+def _get_fragment(llm_buffer, min_output_length, preferred_delimiters, delimiters):
+    """preferred_delimiters and delimiters are the _DelimiterScanner of each list."""
+    delimiter_index = preferred_delimiters.find_last(llm_buffer)
+    if delimiter_index != -1 and is_output_long_enough(llm_buffer[:delimiter_index], min_output_length):
+        return llm_buffer[:delimiter_index + 1]
+    
+    delimiter_index = delimiters.find_last(llm_buffer)
+    if delimiter_index != -1 and is_output_long_enough(llm_buffer[:delimiter_index], min_output_length):
+        return llm_buffer[:delimiter_index + 1]
+    return ""
+
 def get_sentences_needed_for_min_length(sentences_on_buffer, min_output_length):
     word_lengths_of_sentences = list(map(get_num_words, sentences_on_buffer))
     sums_of_word_lens = list(accumulate(word_lengths_of_sentences))
@@ -86,6 +221,475 @@ def get_sentence_end_offset(text, sentences, sentence_count):
     return sentence_end
 
 
+def _get_sentence_end_offset(spans, sentence_count):
+    return spans[2 * sentence_count - 1]
+
+
+
+
+class TimeBasedSentenceSplitter:
+    def __init__(
+        self,
+        lead_time = 1,
+        max_wait_for_fragments = [3, 2],
+        target_tps = 4,
+        min_output_lengths = [2, 3, 3, 4],
+        preferred_sentence_fragment_delimiters = ['. ', '? ', '! ', '\n'],
+        sentence_fragment_delimiters = ['; ', ': ', ', ', '* ', '**', '– '],
+        delimiter_ignore_prefixes = DELIMITER_IGNORE_PREFIXES,
+        wait_for_if_non_fragment = AVOID_PAUSE_WORDS,
+        deadline_offsets_static = [1],
+        deadline_offsets_dynamic = [0],
+        include_metadata = False,
+        tokenizer = "rule-based",
+        language = "en",
+        on_yield = None,
+        clock = time.monotonic,
+    ):
+        """
+        Splits a stream of LLM tokens with the time based strategy of
+        generate_sentences_time_based. Tokens are passed to add() and the
+        outputs that are due are yielded by stream(); flush() yields the rest
+        once the stream has ended. All configuration and state is kept per
+        instance, so any number of splitters can run side by side.
+
+        The clock starts when the splitter is created.
+
+        Args:
+            lead_time (float): amount of time in seconds to wait for the buffer to build for before returning values.
+                Default is 1.
+            max_wait_for_fragments (float): Max amount of time in seconds that the Nth sentence will wait beyond the 
+                "deadline" for a "fragment" (text preceeding a fragment delimiter), which is preferred over a piece of buffer.
+                The last value in the array is used for all subsequent checks.
+                Default is [3, 2].
+            target_tps (float): the rate in tokens per second you want to use to calculate output deadlines.
+                Default is 4. (approximately the speed of human speech)
+            min_output_lengths (int[]]): An array that corresponds to the minimum output size in words 
+                for the corresponding output sentence, the last value in the array is used for all remaining output. 
+                For example [4,5,6] would mean the first piece of output must have 4 words, the second 5 words, and all subsequent 6.
+                Default is [2, 3, 3, 4]
+            preferred_sentence_fragment_delimiters (str[]): Array of strings that deliniate a sentence fragment. "Preferred"
+                are checked first and always used if the fragment meets the length requirement over the other fragment delimiters.
+                Note the trailing spaces, added to differentiate between values like $3.5 and a proper sentence end
+                Default is ['. ', '? ', '! ', '\n']
+            sentence_fragment_delimiters (str[]): Array of strings that are checked after "preferred" delimiters
+                Default is ['; ', ': ', ', ', '* ']
+            delimiter_ignore_prefixes (str[]): Array of strings that will not be considered "delimiters" if preceeded by a delimiter.
+                Used to ignore common abbreviations for things like Mr. Dr. and Mrs. where we don't want to split
+                Default is a long list documented in delimiter_ignore_prefixes
+            wait_for_if_non_fragment (str[]): Array of strings that the algorithm will not use as the last value if the whole buffer
+                is being output. Avoids awkward pauses on common words that are unnatural to pause at. 
+                Default is a long list of common words documented in avoid_pause_words.py
+            deadline_offsets_static float[]: Constant amount of time in seconds to subtract from the deadline for first n sentences.
+                Last value applied to all subsequent sentences
+                Default is [1].
+            deadline_offsets_dynamic float[]: Added to account for the time it takes a TTS engine to generate output. 
+                For example, if it takes your TTS engine around 1 second to generate 10 words, you can use a value of 0.1
+                so that the TTS generation time is included in the deadline. Applied to first n sentences, last value applied to all subsequent
+                Default is [0].
+            include_metadata bool: add metadata to the output returned as the second item in a tuple. 
+                Metadata includes "sentence_type": enum of ["buffer", "fragment", "sentence"]
+            on_yield Callable[[YieldEvent], None]: called with a YieldEvent right before each output is yielded.
+                The reason is "deadline" when the output deadline was reached, "sentences_ahead" when the buffer
+                was far enough ahead to output a sentence early, and "flush" for the text left at the end.
+                Default is None.
+            clock Callable[[], float]: returns the current time in seconds. All times of the strategy, including
+                next_deadline and the YieldEvent times, are values of this clock. Pass a fake clock to replay
+                recorded streams without waiting, see replay_time_based.
+                Default is time.monotonic.
+        """
+        self.lead_time = lead_time
+        self.max_wait_for_fragments = max_wait_for_fragments
+        self.min_output_lengths = min_output_lengths
+        self.delimiter_ignore_prefixes = set(delimiter_ignore_prefixes)
+        self._preferred_fragment_delimiters = _DelimiterScanner(
+            preferred_sentence_fragment_delimiters, self.delimiter_ignore_prefixes
+        )
+        self._fragment_delimiters = _DelimiterScanner(
+            sentence_fragment_delimiters, self.delimiter_ignore_prefixes
+        )
+        self.wait_for_if_non_fragment = wait_for_if_non_fragment
+        self.deadline_offsets_static = deadline_offsets_static
+        self.deadline_offsets_dynamic = deadline_offsets_dynamic
+        self.include_metadata = include_metadata
+        self.tokenizer = tokenizer
+        self.language = language
+        self.on_yield = on_yield
+        self.estimated_time_between_words = 1 / (target_tps * WORDS_PER_TOKEN)
+
+        self.input_buffer = collections.deque()
+        self.llm_buffer = ""
+        self._word_offsets = _WordOffsets()
+        self.clock = clock
+        self.start_time = clock()
+        self.last_sentence_time = clock()
+        self.has_output_started = False
+        self.num_sentences_output = 0
+        self.num_words_output = 0
+        self._first_char_time = None
+        self._yield_count = 0
+        # When re-evaluating the buffer without a new token may yield output
+        self.next_deadline = None
+        self._select_output_settings()
+
+    def add(self, chunk):
+        if self.on_yield is not None and self._first_char_time is None and chunk:
+            self._first_char_time = self.clock()
+        self.input_buffer.append(chunk)
+
+    def _select_output_settings(self):
+        # The settings for the Nth output only change once an output is yielded
+        count = self.num_sentences_output
+        self.min_output_length = get_index_or_last(self.min_output_lengths, count)
+        self.deadline_offset_dynamic = get_index_or_last(self.deadline_offsets_dynamic, count)
+        self.deadline_offset_static = get_index_or_last(self.deadline_offsets_static, count)
+        self.max_wait_for_fragment = get_index_or_last(self.max_wait_for_fragments, count)
+
+    def _report_yield(self, output, reason):
+        self.on_yield(
+            YieldEvent(
+                output,
+                reason,
+                len(self.llm_buffer),
+                self.clock(),
+                self._first_char_time,
+                self._yield_count,
+            )
+        )
+        self._yield_count += 1
+
+    def _handle_output(self, output, sentence_boundary_index=None, metadata={}, reason="deadline"):
+        if not self.has_output_started:
+            #once output has started we go based on TTS start for deadline
+            self.start_time = self.clock()
+            self.has_output_started = True
+        if self.on_yield is not None:
+            self._report_yield(output, reason)
+
+        end_index = len(output)
+        if sentence_boundary_index != None and abs(end_index - sentence_boundary_index) <= 3:
+            end_index = sentence_boundary_index
+        # poll() may evaluate the rest before a token arrives, which would left strip it
+        self._reset_buffer(self.llm_buffer[end_index:].lstrip())
+        self.num_sentences_output += 1
+        self.num_words_output += get_num_words(output)
+        self._select_output_settings()
+        self.last_sentence_time = self.clock()
+        # The rest of the buffer may already be due
+        self.next_deadline = self.last_sentence_time
+        if self.include_metadata:
+            return (output, metadata)
+        return output
+
+    def _reset_buffer(self, text):
+        self.llm_buffer = text
+        self._word_offsets.reset(text)
+        self._preferred_fragment_delimiters.reset()
+        self._fragment_delimiters.reset()
+
+    def _append_token(self, token):
+        if not self.llm_buffer or self.llm_buffer[0].isspace():
+            self._reset_buffer((self.llm_buffer + token).lstrip())
+        else:
+            self._word_offsets.append(token, len(self.llm_buffer))
+            self.llm_buffer += token
+
+    def stream(self):
+        while self.input_buffer:
+            self._append_token(self.input_buffer.popleft())
+            output = self._process_buffer()
+            if output is not None:
+                yield output
+
+    def poll(self):
+        """
+        Yields the output that became due since the last token arrived, if
+        any. Call it at next_deadline, a value of clock, to yield output
+        while the LLM stalls; without a new token the buffer is only
+        evaluated again by stream().
+        """
+        if self.input_buffer:
+            yield from self.stream()
+            return
+        output = self._process_buffer()
+        if output is not None:
+            yield output
+
+    def _output_due_time(self, deadline_offset):
+        """Returns the first time at which _is_output_needed is true for deadline_offset."""
+        # _is_output_needed compares strictly, so the deadline itself is not due yet
+        due_time = _first_time_after(self.start_time, self.num_words_output * self.estimated_time_between_words - deadline_offset)
+        if not self.has_output_started:
+            due_time = max(due_time, _first_time_from(self.start_time, self.lead_time))
+        return due_time
+
+    def _process_buffer(self):
+        """Returns the output that is due for the current buffer, if any."""
+        self.next_deadline = None
+        if not self._word_offsets.has_two_words():
+            #must have at least two words since last token may not be a full word
+            return None
+
+        llm_buffer = self._word_offsets.without_last_word(self.llm_buffer) #remove last word
+
+        spans_on_buffer = _tokenize_sentence_spans(
+            llm_buffer,
+            tokenizer=self.tokenizer,
+            language=self.language,
+        )
+        sentences_on_buffer = _sentences_from_spans(llm_buffer, spans_on_buffer)
+
+        min_output_length = self.min_output_length
+        sentences_needed_for_min_len = get_sentences_needed_for_min_length(sentences_on_buffer, min_output_length)
+
+        current_output = llm_buffer
+        use_first_sentence = len(sentences_on_buffer) > 1 and is_output_long_enough(sentences_on_buffer[0], min_output_length)
+        if use_first_sentence:
+            current_output = sentences_on_buffer[0]
+        else:
+            current_fragment = _get_fragment(
+                llm_buffer,
+                min_output_length,
+                self._preferred_fragment_delimiters,
+                self._fragment_delimiters,
+            )
+            if current_fragment != "":
+                current_output = current_fragment
+
+        num_words_for_offset = get_num_words(current_output)
+        deadline_offset = (num_words_for_offset * self.deadline_offset_dynamic) + self.deadline_offset_static
+
+        output_needed = _is_output_needed(self.has_output_started, self.start_time, self.lead_time, self.num_words_output, self.estimated_time_between_words, deadline_offset, self.clock())
+        if output_needed and use_first_sentence:
+            end_index = _get_sentence_end_offset(spans_on_buffer, 1)
+            return self._handle_output(sentences_on_buffer[0], sentence_boundary_index=end_index, metadata={"sentence_type": "sentence"})
+        elif output_needed:
+            output = current_fragment
+            sentence_type = "fragment"
+            if output == "":
+                output = llm_buffer
+                sentence_type = "buffer"
+                is_not_min_length = get_num_words(output) < min_output_length
+                waiting_for_fragment = (self.clock() - self.last_sentence_time < self.max_wait_for_fragment)
+                if " " in output:
+                    _, last_word = output.rsplit(" ", 1)
+                else:
+                    last_word = output
+                last_word_avoid_pause = last_word in self.wait_for_if_non_fragment
+
+                if is_not_min_length or waiting_for_fragment or last_word_avoid_pause:
+                    if waiting_for_fragment and not (is_not_min_length or last_word_avoid_pause):
+                        self.next_deadline = _first_time_from(self.last_sentence_time, self.max_wait_for_fragment)
+                    return None
+
+            return self._handle_output(output, metadata={"sentence_type": sentence_type})
+        else:
+            if sentences_needed_for_min_len == 0 or sentences_needed_for_min_len + 2 > len(sentences_on_buffer):
+                #two sentences ahead is ideal
+                self.next_deadline = self._output_due_time(deadline_offset)
+                return None
+            end_index = _get_sentence_end_offset(spans_on_buffer, sentences_needed_for_min_len)
+            output = " ".join(sentences_on_buffer[:sentences_needed_for_min_len])
+            return self._handle_output(output, end_index, metadata={"sentence_type": "sentence"}, reason="sentences_ahead")
+
+    def flush(self):
+        #after all tokens are processed yield whatever is left
+        for sentence in _tokenize_sentences(
+            self.llm_buffer,
+            tokenizer=self.tokenizer,
+            language=self.language,
+        ):
+            if self.on_yield is not None:
+                self._report_yield(sentence, "flush")
+            if self.include_metadata:
+                yield (sentence, {"sentence_type": "sentence"})
+            else:
+                yield sentence
+
+
+class _DeadlineScheduler:
+    """
+    Runs callbacks at loop.time() deadlines for all time based streams of an
+    event loop. The deadlines are kept in one heap and only the earliest has
+    a loop timer, so thousands of streams do not each keep timer handles in
+    the loop. Cancelled entries stay in the heap until they come up or
+    outnumber the live ones.
+    """
+
+    def __init__(self, loop):
+        self._loop = weakref.ref(loop)
+        self._heap = []
+        self._counter = itertools.count()
+        self._cancelled = 0
+        self._running = False
+        self._timer = None
+        self._timer_when = None
+
+    def schedule(self, when, callback):
+        """Runs callback at when. Returns an entry that can be cancelled."""
+        entry = [when, next(self._counter), callback]
+        heapq.heappush(self._heap, entry)
+        # While callbacks run, the timer is armed for the earliest entry afterwards
+        if not self._running and (self._timer_when is None or when < self._timer_when):
+            self._arm(when)
+        return entry
+
+    def cancel(self, entry):
+        if entry[2] is not None:
+            entry[2] = None
+            self._cancelled += 1
+            if not self._running and self._cancelled > len(self._heap) // 2:
+                self._heap = [entry for entry in self._heap if entry[2] is not None]
+                heapq.heapify(self._heap)
+                self._cancelled = 0
+
+    def _arm(self, when):
+        if self._timer is not None:
+            self._timer.cancel()
+        self._timer = self._loop().call_at(when, self._run)
+        self._timer_when = when
+
+    def _run(self):
+        self._timer = self._timer_when = None
+        heap = self._heap
+        now = self._loop().time()
+        # Entries scheduled by the callbacks wait for the next pass, even if they are due
+        end = next(self._counter)
+        self._running = True
+        try:
+            while heap and heap[0][0] <= now and heap[0][1] < end:
+                callback = heapq.heappop(heap)[2]
+                if callback is None:
+                    self._cancelled -= 1
+                else:
+                    callback()
+        finally:
+            self._running = False
+            if heap:
+                self._arm(heap[0][0])
+
+
+_deadline_schedulers = weakref.WeakKeyDictionary()
+
+
+def _get_deadline_scheduler(loop):
+    scheduler = _deadline_schedulers.get(loop)
+    if scheduler is None:
+        scheduler = _deadline_schedulers[loop] = _DeadlineScheduler(loop)
+    return scheduler
+
+
+async def _scheduled_outputs(splitter, generator):
+    """
+    Yields the outputs of splitter for the tokens of generator, plus the
+    outputs that become due at splitter.next_deadline while no token arrives.
+    """
+    import asyncio
+
+    loop = asyncio.get_running_loop()
+    scheduler = _get_deadline_scheduler(loop)
+    outputs = asyncio.Queue()
+    end_of_tokens = object()
+    timer = None
+
+    def arm():
+        nonlocal timer
+        if timer is not None:
+            scheduler.cancel(timer)
+            timer = None
+        if splitter.next_deadline is not None:
+            delay = splitter.next_deadline - splitter.clock()
+            timer = scheduler.schedule(loop.time() + delay, on_deadline)
+
+    def on_deadline():
+        nonlocal timer
+        timer = None
+        try:
+            for output in splitter.poll():
+                outputs.put_nowait(output)
+            arm()
+        except Exception as error:
+            # Raised to the consumer, the event loop would only log it
+            outputs.put_nowait(error)
+
+    async def read_tokens():
+        try:
+            async for token in generator:
+                splitter.add(token)
+                for output in splitter.stream():
+                    outputs.put_nowait(output)
+                arm()
+        finally:
+            splitter.next_deadline = None
+            arm()
+            outputs.put_nowait(end_of_tokens)
+
+    reader = loop.create_task(read_tokens())
+    try:
+        while True:
+            output = await outputs.get()
+            if output is end_of_tokens:
+                break
+            if isinstance(output, Exception):
+                raise output
+            yield output
+        # Raises the exception of the token generator, if any
+        await reader
+    finally:
+        reader.cancel()
+
+
+class _VirtualClock:
+    """A clock that only moves when it is set, for replays."""
+
+    __slots__ = ("now",)
+
+    def __init__(self, now=0.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+# How late a replayed deadline timer fires; real timers never fire exactly on time
+_REPLAY_TIMER_DELAY = 1e-6
+
+
+def replay_time_based(records, schedule_deadlines=False, **options):
+    """
+    Runs the time based strategy over a recorded token stream in virtual
+    time, so a replay takes no longer than the computation.
+
+    Args:
+        records (Iterable[tuple[str, float]]): The tokens, each with the time
+            in seconds after the start of the stream at which it arrived.
+        schedule_deadlines (bool): If True, output that becomes due between
+            two tokens is yielded at its deadline, like
+            generate_sentences_time_based_async(schedule_deadlines=True) does.
+            Otherwise it waits for the next token, like
+            generate_sentences_time_based. Default is False.
+        **options: Parameters of TimeBasedSentenceSplitter other than clock.
+
+    Returns:
+        list[tuple[float, str]]: Each output with the virtual time it was
+          yielded at.
+    """
+    clock = _VirtualClock()
+    splitter = TimeBasedSentenceSplitter(clock=clock, **options)
+    outputs = []
+    for token, seconds in records:
+        if schedule_deadlines:
+            while splitter.next_deadline is not None and splitter.next_deadline + _REPLAY_TIMER_DELAY < seconds:
+                clock.now = max(clock.now, splitter.next_deadline + _REPLAY_TIMER_DELAY)
+                outputs.extend((clock.now, output) for output in splitter.poll())
+        clock.now = max(clock.now, seconds)
+        splitter.add(token)
+        outputs.extend((clock.now, output) for output in splitter.stream())
+
+    outputs.extend((clock.now, output) for output in splitter.flush())
+    return outputs
+
+
 def generate_sentences_time_based(
     generator, 
     lead_time = 1,
@@ -101,6 +705,8 @@ def generate_sentences_time_based(
     include_metadata = False,
     tokenizer = "rule-based",
     language = "en",
+    on_yield = None,
+    clock = time.monotonic,
 ):
     """
     Uses a time based strategy to determine whether to yield. A target tps is provided,
@@ -142,117 +748,103 @@ def generate_sentences_time_based(
             Default is [0].
         include_metadata bool: add metadata to the output returned as the second item in a tuple. 
             Metadata includes "sentence_type": enum of ["buffer", "fragment", "sentence"]
+        on_yield Callable[[YieldEvent], None]: called with a YieldEvent right before each output is yielded.
+            The reason is "deadline" when the output deadline was reached, "sentences_ahead" when the buffer
+            was far enough ahead to output a sentence early, and "flush" for the text left at the end.
+            Default is None.
+        clock Callable[[], float]: returns the current time in seconds. All times of the strategy, including
+            next_deadline and the YieldEvent times, are values of this clock. Pass a fake clock to replay
+            recorded streams without waiting, see replay_time_based.
+            Default is time.monotonic.
         
     Yields:
         Iterator[str]: An iterator of complete sentences constructed from the
           input text stream.
     """
-    global preferred_sentence_fragment_delimiters_global, sentence_fragment_delimiters_global, delimiter_ignore_prefixes_global
-    preferred_sentence_fragment_delimiters_global = set(preferred_sentence_fragment_delimiters)
-    sentence_fragment_delimiters_global = set(sentence_fragment_delimiters)
-    delimiter_ignore_prefixes_global = set(delimiter_ignore_prefixes)
-    start_time = time.time()
-    last_sentence_time = time.time()
-    estimated_time_between_words = 1 / (target_tps * WORDS_PER_TOKEN)
-    output_sentences = []
-    llm_buffer_full = ""
-    has_output_started = False
-
-
-    def handle_output(output, sentence_boundary_index=None, metadata={}):
-        nonlocal has_output_started, llm_buffer_full, output_sentences, min_output_lengths, start_time, last_sentence_time, include_metadata
-        if not has_output_started:
-            #once output has started we go based on TTS start for deadline
-            start_time = time.time()
-            has_output_started = True
-        
-        end_index = len(output)
-        if sentence_boundary_index != None and abs(end_index - sentence_boundary_index) <= 3:
-            end_index = sentence_boundary_index
-        llm_buffer_full = llm_buffer_full[end_index:]
-        output_sentences.append(output)
-        last_sentence_time = time.time()
-        if include_metadata:
-            return (output, metadata)
-        return output
-
+    splitter = TimeBasedSentenceSplitter(
+        lead_time=lead_time,
+        max_wait_for_fragments=max_wait_for_fragments,
+        target_tps=target_tps,
+        min_output_lengths=min_output_lengths,
+        preferred_sentence_fragment_delimiters=preferred_sentence_fragment_delimiters,
+        sentence_fragment_delimiters=sentence_fragment_delimiters,
+        delimiter_ignore_prefixes=delimiter_ignore_prefixes,
+        wait_for_if_non_fragment=wait_for_if_non_fragment,
+        deadline_offsets_static=deadline_offsets_static,
+        deadline_offsets_dynamic=deadline_offsets_dynamic,
+        include_metadata=include_metadata,
+        tokenizer=tokenizer,
+        language=language,
+        on_yield=on_yield,
+        clock=clock,
+    )
     for token in generator:
-        llm_buffer_full += token
-        llm_buffer_full = llm_buffer_full.lstrip()
-        if len(llm_buffer_full.split(None, 2)) < 2:
-            #must have at least two words since last token may not be a full word
-            continue
-
-        llm_buffer = llm_buffer_full.rsplit(" ", 1)[0] #remove last word
-
-        sentences_on_buffer = _tokenize_sentences(
-            llm_buffer,
-            tokenizer=tokenizer,
-            language=language,
-        )
+        splitter.add(token)
+        yield from splitter.stream()
 
-        num_sentences_output = len(output_sentences)
-        min_output_length = get_index_or_last(min_output_lengths, num_sentences_output)
-        sentences_needed_for_min_len = get_sentences_needed_for_min_length(sentences_on_buffer, min_output_length)
+    yield from splitter.flush()
 
-        current_output = llm_buffer
-        use_first_sentence = len(sentences_on_buffer) > 1 and is_output_long_enough(sentences_on_buffer[0], min_output_length)
-        if use_first_sentence:
-            current_output = sentences_on_buffer[0]
-        else:
-            current_fragment = get_fragment(llm_buffer, min_output_length)
-            if current_fragment != "":
-                current_output = current_fragment
-        
-        num_words_for_offset = get_num_words(current_output)
-        deadline_offset_dynamic = get_index_or_last(deadline_offsets_dynamic, num_sentences_output)
-        deadline_offset_static = get_index_or_last(deadline_offsets_static, num_sentences_output)
-        deadline_offset = (num_words_for_offset * deadline_offset_dynamic) + deadline_offset_static
 
-        output_needed = is_output_needed(has_output_started, start_time, lead_time, output_sentences, estimated_time_between_words, deadline_offset)
-        if output_needed and use_first_sentence:
-            end_index = get_sentence_end_offset(llm_buffer_full, sentences_on_buffer, 1)
-            yield handle_output(sentences_on_buffer[0], sentence_boundary_index=end_index, metadata={"sentence_type": "sentence"})
-        elif output_needed:
-            output = current_fragment
-            sentence_type = "fragment"
-            if output == "":
-                output = llm_buffer
-                sentence_type = "buffer"
-                is_not_min_length = get_num_words(output) < min_output_length
-                max_wait_for_fragment = get_index_or_last(max_wait_for_fragments, num_sentences_output)
-                waiting_for_fragment = (time.time() - last_sentence_time < max_wait_for_fragment)
-                if " " in output:
-                    _, last_word = output.rsplit(" ", 1)
-                else:
-                    last_word = output
-                last_word_avoid_pause = last_word in wait_for_if_non_fragment
+async def generate_sentences_time_based_async(
+    generator, 
+    lead_time = 1,
+    max_wait_for_fragments = [3, 2],
+    target_tps = 4,
+    min_output_lengths = [2, 3, 3, 4],
+    preferred_sentence_fragment_delimiters = ['. ', '? ', '! ', '\n'],
+    sentence_fragment_delimiters = ['; ', ': ', ', ', '* ', '**', '– '],
+    delimiter_ignore_prefixes = DELIMITER_IGNORE_PREFIXES,
+    wait_for_if_non_fragment = AVOID_PAUSE_WORDS,
+    deadline_offsets_static = [1],
+    deadline_offsets_dynamic = [0],
+    include_metadata = False,
+    tokenizer = "rule-based",
+    language = "en",
+    on_yield = None,
+    schedule_deadlines = False,
+    clock = time.monotonic,
+):
+    """
+    Async variant of generate_sentences_time_based for an async generator of
+    tokens. Takes the same arguments. Every call uses its own
+    TimeBasedSentenceSplitter, so one event loop can drive many streams with
+    different settings.
 
-                if is_not_min_length or waiting_for_fragment or last_word_avoid_pause:
-                    continue
-            
-            yield handle_output(output, metadata={"sentence_type": sentence_type})
-        else:
-            if sentences_needed_for_min_len == 0 or sentences_needed_for_min_len + 2 > len(sentences_on_buffer):
-                #two sentences ahead is ideal
-                continue
-            end_index = get_sentence_end_offset(
-                llm_buffer_full,
-                sentences_on_buffer,
-                sentences_needed_for_min_len,
-            )
-            output = " ".join(sentences_on_buffer[:sentences_needed_for_min_len])
-            yield handle_output(output, end_index, metadata={"sentence_type": "sentence"})
+    Args:
+        schedule_deadlines bool: if True, output also becomes due while no tokens arrive. A timer is
+            armed for the next output deadline and the best available output is yielded when it fires,
+            instead of when the next token arrives. The timers of all streams on an event loop share one
+            scheduler. Default is False.
 
-    #after all tokens are processed yield whatever is left
-    for sentence in _tokenize_sentences(
-        llm_buffer_full,
+    Yields:
+        AsyncIterator[str]: An iterator of complete sentences constructed from
+          the input text stream.
+    """
+    splitter = TimeBasedSentenceSplitter(
+        lead_time=lead_time,
+        max_wait_for_fragments=max_wait_for_fragments,
+        target_tps=target_tps,
+        min_output_lengths=min_output_lengths,
+        preferred_sentence_fragment_delimiters=preferred_sentence_fragment_delimiters,
+        sentence_fragment_delimiters=sentence_fragment_delimiters,
+        delimiter_ignore_prefixes=delimiter_ignore_prefixes,
+        wait_for_if_non_fragment=wait_for_if_non_fragment,
+        deadline_offsets_static=deadline_offsets_static,
+        deadline_offsets_dynamic=deadline_offsets_dynamic,
+        include_metadata=include_metadata,
         tokenizer=tokenizer,
         language=language,
-    ):
-        if include_metadata:
-            yield (sentence, {"sentence_type": "sentence"})
-        else:
-            yield sentence
-
+        on_yield=on_yield,
+        clock=clock,
+    )
+    if schedule_deadlines:
+        async for output in _scheduled_outputs(splitter, generator):
+            yield output
+    else:
+        async for token in generator:
+            splitter.add(token)
+            for output in splitter.stream():
+                yield output
 
+    for output in splitter.flush():
+        yield output
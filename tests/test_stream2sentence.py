@@ -1,7 +1,11 @@
+import asyncio
 import importlib
 import inspect
+import json
 import os
 import re
+import subprocess
+import sys
 import unittest
 from unittest import mock
 from stream2sentence import SentenceSplitter, generate_sentences, generate_sentences_async
@@ -84,6 +88,118 @@ class TestSentenceGenerator(unittest.TestCase):
                 default = inspect.signature(callable_).parameters["tokenizer"].default
                 self.assertEqual(default, "rule-based")
 
+    def test_import_defers_optional_modules_to_first_use(self):
+        lazy_modules = [
+            "nltk",
+            "stanza",
+            "multiprocessing",
+            "inspect",
+            "stream2sentence.stream2sentence_time_based",
+        ]
+        script = (
+            "import sys\n"
+            "import stream2sentence\n"
+            f"print([name for name in {lazy_modules!r} if name in sys.modules])\n"
+            "print(stream2sentence.stream2sentence_time_based.generate_sentences_time_based.__name__)\n"
+            "from stream2sentence import generate_sentences_time_based\n"
+            "print(list(stream2sentence.generate_sentences(iter('Hi there 😀 you.'), "
+            "cleanup_text_emojis=True)))\n"
+        )
+        result = subprocess.run(
+            [sys.executable, "-c", script],
+            capture_output=True,
+            check=True,
+            cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+            text=True,
+        )
+
+        self.assertEqual(
+            result.stdout.splitlines(),
+            ["[]", "generate_sentences_time_based", "['Hi there  you.']"],
+        )
+
+    def test_package_lists_its_public_api(self):
+        package = importlib.import_module("stream2sentence")
+        self.assertEqual(dir(package), sorted(package.__all__))
+        self.assertIn("TimeBasedSentenceSplitter", dir(package))
+        namespace = {}
+        exec("from stream2sentence import *", namespace)
+        for name in package.__all__:
+            with self.subTest(name=name):
+                self.assertIs(namespace[name], getattr(package, name))
+
+    def test_sync_generator_drives_splitter_without_async_generator(self):
+        text = "Hello there. How are you doing today? I am fine, thanks."
+        chunks = chunk_text(text, 3)
+
+        async def async_chunks():
+            for chunk in chunks:
+                yield chunk
+
+        async def collect():
+            return [
+                sentence
+                async for sentence in generate_sentences_async(
+                    async_chunks(),
+                    minimum_sentence_length=5,
+                )
+            ]
+
+        started_async_generators = []
+        old_hooks = sys.get_asyncgen_hooks()
+        sys.set_asyncgen_hooks(firstiter=started_async_generators.append)
+        try:
+            sentences = list(generate_sentences(iter(chunks), minimum_sentence_length=5))
+        finally:
+            sys.set_asyncgen_hooks(*old_hooks)
+
+        self.assertEqual(started_async_generators, [])
+
+        self.assertEqual(sentences, asyncio.run(collect()))
+        self.assertEqual(sentences, ["Hello there.", "How are you doing today?", "I am fine, thanks."])
+
+    def test_split_many_matches_whole_text_tokenization(self):
+        stream2sentence_module = importlib.import_module("stream2sentence.stream2sentence")
+        texts = [
+            "Dr. Smith arrived. The meeting started at 9 a.m. sharp!",
+            "",
+            "One sentence only",
+            "Is this it? Yes. It is.",
+        ] * 3
+        expected = [
+            [
+                sentence.strip()
+                for sentence in stream2sentence_module._tokenize_sentences(
+                    text,
+                    tokenizer="rule-based",
+                    language="en",
+                )
+                if sentence.strip()
+            ]
+            for text in texts
+        ]
+        splitter = SentenceSplitter()
+
+        self.assertEqual(list(splitter.split_many(texts, processes=1)), expected)
+        self.assertEqual(list(splitter.split_many(texts, processes=2, chunksize=2)), expected)
+        self.assertEqual(
+            sorted(splitter.split_many(texts, processes=2, chunksize=3, ordered=False)),
+            list(enumerate(expected)),
+        )
+        with mock.patch("multiprocessing.Pool", side_effect=AssertionError("small batches split in-process")):
+            self.assertEqual(list(splitter.split_many(iter(texts))), expected)
+            self.assertEqual(
+                list(splitter.split_many(texts, ordered=False)),
+                list(enumerate(expected)),
+            )
+        self.assertEqual(
+            [
+                list(spans)
+                for spans in splitter.split_many(texts[:4], processes=1, return_offsets=True)
+            ],
+            [[0, 18, 19, 55], [], [0, 17], [0, 11, 12, 16, 17, 23]],
+        )
+
     def test_default_tokenizer_does_not_load_optional_dependencies(self):
         with mock.patch(
             "stream2sentence.stream2sentence._load_optional_dependency",
@@ -143,6 +259,9 @@ class TestSentenceGenerator(unittest.TestCase):
             "debug",
             "auto_context",
             "never_split_numbers",
+            "stanza_tokenize_interval",
+            "stanza_left_context",
+            "on_yield",
         ]
 
         for callable_ in (generate_sentences, generate_sentences_async, SentenceSplitter):
@@ -380,6 +499,47 @@ class TestSentenceGenerator(unittest.TestCase):
             minimum_first_fragment_length=6,
         )
 
+    def test_on_yield_reports_the_reason_of_every_yield(self):
+        cases = [
+            (
+                "First, this. Second, this.",
+                {"minimum_sentence_length": 3, "minimum_first_fragment_length": 3},
+                [("First,", "quick_yield", 6), ("this.", "flush", 19), ("Second, this.", "flush", 19)],
+            ),
+            (
+                "One two three four five six seven. Eight nine ten eleven twelve. More",
+                {"force_first_fragment_after_words": 3},
+                [
+                    ("One two three", "forced_after_words", 14),
+                    ("four five six seven.", "context_window", 52),
+                    ("Eight nine ten eleven twelve.", "context_window", 52),
+                    ("More", "flush", 4),
+                ],
+            ),
+        ]
+        for text, options, expected in cases:
+            with self.subTest(text=text):
+                events = []
+                splitter = SentenceSplitter(
+                    quick_yield_single_sentence_fragment=True,
+                    on_yield=events.append,
+                    **options,
+                )
+                sentences = []
+                for char in text:
+                    splitter.add(char)
+                    sentences.extend(splitter.stream())
+                sentences.extend(splitter.flush())
+
+                self.assertEqual(
+                    [(event.text, event.reason, event.buffer_length) for event in events],
+                    expected,
+                )
+                self.assertEqual([event.text for event in events], sentences)
+                self.assertEqual([event.index for event in events], list(range(len(events))))
+                times = [events[0].first_char_time] + [event.time for event in events]
+                self.assertEqual(times, sorted(times))
+
     def test_quick_yield_does_not_split_decimal_price(self):
         text = "The price for Pure Leaf Sweet Tea is $3.5 for small size and $5 for large size."
         expected = ["The price for Pure Leaf Sweet Tea is $3.5 for small size and $5 for large size."]
@@ -494,6 +654,21 @@ class TestSentenceGenerator(unittest.TestCase):
             with self.subTest(text=text):
                 self.assertQuickYieldSingleSentence(text)
 
+    def test_rule_based_tokenizer_does_not_split_urls_longer_than_the_context(self):
+        stream2sentence_module = importlib.import_module("stream2sentence.stream2sentence")
+        text = "See https://example.com/" + "a" * 300 + "?Then we go. Ok fine."
+        expected = [text[:-len(" Ok fine.")], "Ok fine."]
+
+        self.assertEqual(stream2sentence_module._rule_based_tokenize_sentences(text), expected)
+        tokenizer = stream2sentence_module._IncrementalRuleBasedTokenizer("en")
+        for end in range(len(text) - 20, len(text) + 1):
+            with self.subTest(end=end):
+                self.assertEqual(
+                    tokenizer.tokenize(text[:end]),
+                    stream2sentence_module._rule_based_tokenize_sentences(text[:end]),
+                )
+        self.assertEqual(list(generate_sentences(iter(text))), expected)
+
     def test_quick_yield_does_not_split_email_addresses(self):
         cases = [
             "Email support@example.com before noon.",
@@ -635,6 +810,245 @@ class TestSentenceGenerator(unittest.TestCase):
             with self.subTest(text=text):
                 self.assertQuickYieldSingleSentence(text)
 
+    def test_abbreviation_matcher_reads_only_the_text_tail(self):
+        boundary_module = importlib.import_module("stream2sentence.quick_yield_boundary")
+        cases = [
+            ("en", "Smith ET AL.", "et al."),
+            ("en", "see (Fig.", "fig."),
+            ("en", "at 3p.m.", "p.m."),
+            ("en", "Doctor.", None),
+            ("de", "Die Stra\u00dfe u. v. m.", "u. v. m."),
+            ("de", "STRA\u00dfE U. V. M.", "u. v. m."),
+            ("de", "Ende.", None),
+        ]
+        for language, text, expected in cases:
+            detector = boundary_module.get_boundary_detector(language)
+            with self.subTest(language=language, text=text):
+                self.assertEqual(detector._matching_abbreviation(text), expected)
+                self.assertEqual(
+                    detector._matching_abbreviation("x " * 500 + text),
+                    expected,
+                )
+
+    def test_language_bundles_match_language_contexts(self):
+        boundary_module = importlib.import_module("stream2sentence.quick_yield_boundary")
+        self.assertEqual(
+            boundary_module._load_bundle("aliases"),
+            boundary_module._build_language_aliases(),
+            "run tools/build_language_bundles.py",
+        )
+        for language in boundary_module._load_language_contexts()["languages"]:
+            with self.subTest(language=language):
+                self.assertEqual(
+                    boundary_module._load_bundle(language),
+                    boundary_module._build_language_bundle(language),
+                    "run tools/build_language_bundles.py",
+                )
+
+        self.assertEqual(boundary_module._normalize_language("German"), "de")
+        self.assertEqual(boundary_module._normalize_language("klingon"), "en")
+
+    def test_classify_at_matches_classify_on_sliced_buffer(self):
+        boundary_module = importlib.import_module("stream2sentence.quick_yield_boundary")
+        detector = boundary_module.get_boundary_detector("en")
+        text = "(A side note about Dr. Smith " + CONSENSUS_STRESS_INPUT
+
+        for index, char in enumerate(text):
+            if char not in ".?!,:;-)]}":
+                continue
+            for start in (0, max(0, index - 40)):
+                for end in (index + 1, min(len(text), index + 3), len(text)):
+                    next_char = text[index + 1] if index + 1 < end else None
+                    with self.subTest(index=index, start=start, end=end):
+                        self.assertEqual(
+                            detector.classify_at(text, index, start, end),
+                            detector.classify(
+                                text[start:end],
+                                index - start,
+                                next_char,
+                            ),
+                        )
+
+    def test_context_window_is_bounded_for_long_tokens(self):
+        boundary_module = importlib.import_module("stream2sentence.quick_yield_boundary")
+        detector = boundary_module.get_boundary_detector("en")
+        text = '{"a":1,' * 200 + '"b":2}'
+        index = text.index(",", len(text) // 2)
+
+        window_start, window_end = detector.context_window(text, index)
+
+        self.assertGreaterEqual(window_start, index + 1 - detector.max_lookbehind_chars)
+        self.assertLessEqual(window_end, index + 2 + detector.max_lookahead_chars)
+        self.assertTrue(detector.has_stable_right_context(text, index))
+        self.assertFalse(
+            detector.has_stable_right_context(text[:index + 10], index)
+        )
+
+    def test_context_window_covers_rule_tokens(self):
+        boundary_module = importlib.import_module("stream2sentence.quick_yield_boundary")
+        detector = boundary_module.get_boundary_detector("en")
+        text = "Long preamble words here. The initials are J. R. R. Tolkien and more words follow now."
+        index = text.index("R. Tolkien") + 1
+
+        window_start, window_end = detector.context_window(text, index)
+
+        self.assertEqual(text[window_start:index + 1], "The initials are J. R. R.")
+        self.assertEqual(text[index + 1:window_end], " Tolkien and more words follow ")
+
+    def test_bracket_tracker_matches_rfind_after_consume(self):
+        boundary_module = importlib.import_module("stream2sentence.quick_yield_boundary")
+        text = "a (b [c] d) e {f (g} h) i] (j {k) l} m"
+        tracker = boundary_module.BracketTracker()
+        for index, char in enumerate(text):
+            tracker.append(char, index)
+
+        consumed = 0
+        for count in (0, 3, 6, 7):
+            tracker.consume(count)
+            consumed += count
+            buffer = text[consumed:]
+            for index, char in enumerate(buffer):
+                if char not in ")]}":
+                    continue
+                opener = {")": "(", "]": "[", "}": "{"}[char]
+                with self.subTest(consumed=consumed, index=index):
+                    self.assertEqual(
+                        tracker.is_open_before(char, index),
+                        buffer.rfind(opener, 0, index) > buffer.rfind(char, 0, index),
+                    )
+
+    def test_url_tracker_matches_last_word_check_after_consume(self):
+        boundary_module = importlib.import_module("stream2sentence.quick_yield_boundary")
+        text = "see https://a.io/x?q=1 then ftp://b.org/ ok? and :// x?y http:/ /z?"
+        for size in (1, 2, 5):
+            tracker = boundary_module.UrlTracker()
+            for index in range(0, len(text), size):
+                tracker.append(text[index:index + size], index)
+
+            consumed = 0
+            for count in (0, 5, 13, 20):
+                tracker.consume(count)
+                consumed += count
+                buffer = text[consumed:]
+                for index, char in enumerate(buffer):
+                    if char.isspace():
+                        continue
+                    with self.subTest(size=size, consumed=consumed, index=index):
+                        self.assertEqual(
+                            tracker.in_url_token(index),
+                            "://" in buffer[:index + 1].rsplit(None, 1)[-1],
+                        )
+
+    def test_sentence_cache_tokenizes_only_the_unsettled_tail(self):
+        module = importlib.import_module("stream2sentence.stream2sentence")
+        text = (
+            "Dr. Smith arrived early. The meeting started at nine and ran long. "
+            "Everyone agreed on the plan. Notes were shared afterwards with the team"
+        )
+        pattern = re.compile(r"\S.*?(?:(?<!Dr)\.(?=\s|$)|$)\s*", re.S)
+
+        def tokenize(part):
+            seen.append(part)
+            return [match.group() for match in pattern.finditer(part)]
+
+        cache = module._StableSentenceCache()
+        seen = []
+        for end in range(1, len(text) + 1):
+            with self.subTest(end=end):
+                self.assertEqual(cache.tokenize(text[:end], tokenize), tokenize(text[:end]))
+
+        self.assertLess(len(seen[-2]), 60)
+
+    def test_sentence_cache_lets_the_tokenizer_move_detached_closing_marks(self):
+        module = importlib.import_module("stream2sentence.stream2sentence")
+
+        def tokenize(part):
+            # Like Punkt, attaches a closing mark after a period to that sentence
+            return re.findall(r"\S.*?(?:\.(?:\s+[\"')])?(?=\s|$)|$)", part, re.S)
+
+        cases = [
+            'It was over. " Then they all walked home together after dinner and talked for hours about it.',
+            "She told him to stop. ) Then they all walked home together after dinner and talked for hours.",
+        ]
+        for text in cases:
+            cache = module._StableSentenceCache()
+            for end in range(1, len(text) + 1):
+                with self.subTest(text=text, end=end):
+                    self.assertEqual(cache.tokenize(text[:end], tokenize), tokenize(text[:end]))
+
+        with mock.patch("nltk.tokenize.sent_tokenize", side_effect=tokenize), mock.patch.object(
+            module, "nltk_initialized", True
+        ):
+            self.assertEqual(
+                list(module.generate_sentences(iter(cases[0]), tokenizer="nltk")),
+                tokenize(cases[0]),
+            )
+
+    def test_consensus_asks_punkt_only_about_rule_based_candidates(self):
+        module = importlib.import_module("stream2sentence.stream2sentence")
+        text = (
+            "Dr. Smith arrived early. The meeting started at nine and ran long. "
+            "Everyone agreed on the plan, i.e. the budget. Notes were shared afterwards."
+        )
+
+        def sent_tokenize(part):
+            seen.append(part)
+            return re.findall(r"\S.*?(?:(?<!Dr)\.(?=\s|$)|$)", part, re.S)
+
+        seen = []
+        punkt_decisions = module._PunktDecisionCache()
+        rule_based_tokenizer = module._IncrementalRuleBasedTokenizer("en")
+        with mock.patch("nltk.tokenize.sent_tokenize", side_effect=sent_tokenize):
+            for end in range(1, len(text) + 1):
+                with self.subTest(end=end):
+                    self.assertEqual(
+                        module._tokenize_sentences(
+                            text[:end],
+                            tokenizer="nltk+rule-based",
+                            language="en",
+                            rule_based_tokenizer=rule_based_tokenizer,
+                            punkt_decisions=punkt_decisions,
+                        ),
+                        module._tokenize_sentences(
+                            text[:end], tokenizer="nltk+rule-based", language="en"
+                        ),
+                    )
+            seen.clear()
+            for end in range(1, len(text) + 1):
+                module._tokenize_sentences(
+                    text[:end],
+                    tokenizer="nltk+rule-based",
+                    language="en",
+                    rule_based_tokenizer=rule_based_tokenizer,
+                    punkt_decisions=punkt_decisions,
+                )
+
+        self.assertEqual(seen, [])
+
+    def test_sentence_cache_batches_model_tokenizer_calls(self):
+        module = importlib.import_module("stream2sentence.stream2sentence")
+        text = (
+            "The first sentence is settled by now. Another one follows it here. "
+            "And the last words keep arriving slowly"
+        )
+
+        def tokenize(part):
+            seen.append(part)
+            return re.findall(r"\S.*?(?:\.(?=\s|$)|$)", part, re.S)
+
+        cache = module._StableSentenceCache(left_context=20, interval=8, delimiters=".")
+        seen = []
+        for end in range(1, len(text) + 1):
+            sentences = cache.tokenize(text[:end], tokenize)
+            self.assertEqual(" ".join(" ".join(sentences).split()), " ".join(text[:end].split()))
+
+        self.assertLess(len(seen), len(text) // 4)
+        calls = len(seen)
+        cache.expire()
+        self.assertEqual(cache.tokenize(text, tokenize)[-1], "And the last words keep arriving slowly")
+        self.assertEqual(len(seen), calls + 1)
+        self.assertEqual(seen[-1], "follows it here. And the last words keep arriving slowly")
+
     def test_quick_yield_preserves_closing_marks(self):
         cases = [
             ('"Hello." Next.', ['"Hello."', "Next."]),
@@ -753,6 +1167,46 @@ class TestSentenceGenerator(unittest.TestCase):
             stream2sentence_module.current_tokenizer = old_tokenizer
             stream2sentence_module.current_language = old_language
 
+    def test_splitters_keep_their_own_tokenizer_and_stanza_pipeline(self):
+        stream2sentence_module = importlib.import_module("stream2sentence.stream2sentence")
+        registry = stream2sentence_module._TokenizerRegistry()
+
+        class FakePipeline:
+            def __init__(self, language, download_method=None):
+                self.language = language
+
+            def __call__(self, text):
+                sentence = mock.Mock(text=f"{self.language}:{text}")
+                return mock.Mock(sentences=[sentence])
+
+        fake_stanza = mock.Mock(Pipeline=mock.Mock(side_effect=FakePipeline))
+        old_tokenizer = stream2sentence_module.current_tokenizer
+        with mock.patch.object(stream2sentence_module, "_tokenizer_registry", registry):
+            with mock.patch.object(
+                stream2sentence_module,
+                "_load_optional_dependency",
+                return_value=fake_stanza,
+            ):
+                german = SentenceSplitter(tokenizer="stanza", language="de")
+                french = SentenceSplitter(tokenizer="stanza", language="fr")
+                SentenceSplitter(tokenizer="stanza", language="de")
+                rule_based = SentenceSplitter(tokenizer="rule-based")
+
+                self.assertEqual(fake_stanza.Pipeline.call_count, 2)
+                self.assertEqual(stream2sentence_module.current_tokenizer, old_tokenizer)
+                self.assertEqual(
+                    (german.tokenizer, french.tokenizer, rule_based.tokenizer),
+                    ("stanza", "stanza", "rule-based"),
+                )
+                self.assertEqual(
+                    stream2sentence_module._stanza_tokenize_sentences("Hallo.", "de"),
+                    ["de:Hallo."],
+                )
+                self.assertEqual(
+                    stream2sentence_module._stanza_tokenize_sentences("Salut.", "fr"),
+                    ["fr:Salut."],
+                )
+
     def test_initialize_nltk_uses_installed_punkt_tab_without_download(self):
         stream2sentence_module = importlib.import_module("stream2sentence.stream2sentence")
         old_initialized = stream2sentence_module.nltk_initialized
@@ -2211,6 +2665,115 @@ class TestSentenceGenerator(unittest.TestCase):
                 ))
                 self.assertEqual(sentences, expected)
 
+    def test_incremental_rule_based_tokenizer_matches_full_rescan(self):
+        stream2sentence_module = importlib.import_module("stream2sentence.stream2sentence")
+        tokenizer = stream2sentence_module._IncrementalRuleBasedTokenizer("en")
+
+        for end in range(len(CONSENSUS_STRESS_INPUT) + 1):
+            text = CONSENSUS_STRESS_INPUT[:end]
+            self.assertEqual(
+                tokenizer.tokenize(text),
+                stream2sentence_module._rule_based_tokenize_sentences(text, "en"),
+                msg=text,
+            )
+
+        self.assertEqual(
+            tokenizer.tokenize("One. Two."),
+            ["One.", "Two."],
+        )
+
+    def test_sentence_spans_locate_repeated_sentences(self):
+        stream2sentence_module = importlib.import_module("stream2sentence.stream2sentence")
+        text = "Go. Go. Go there now. Go."
+
+        spans = stream2sentence_module._tokenize_sentence_spans(
+            text,
+            tokenizer="rule-based",
+            language="en",
+        )
+        self.assertEqual(spans.typecode, "I")
+        self.assertEqual(list(spans), [0, 3, 4, 7, 8, 21, 22, 25])
+
+        with mock.patch(
+            "nltk.tokenize.sent_tokenize",
+            return_value=["Go.", "Go. Go there now.", "Go."],
+        ):
+            spans = stream2sentence_module._tokenize_sentence_spans(
+                text,
+                tokenizer="nltk+rule-based",
+                language="en",
+            )
+        self.assertEqual(
+            stream2sentence_module._sentences_from_spans(text, spans),
+            ["Go.", "Go. Go there now.", "Go."],
+        )
+        self.assertEqual(list(spans), [0, 3, 4, 21, 22, 25])
+
+    def test_incremental_rule_based_tokenizer_skips_settled_terminators(self):
+        stream2sentence_module = importlib.import_module("stream2sentence.stream2sentence")
+        tokenizer = stream2sentence_module._IncrementalRuleBasedTokenizer("en")
+        text = "Version 1.2.3 is out and e.g. v2.0 is next, see docs.example.com now " * 20
+
+        tokenizer.tokenize(text)
+        with mock.patch.object(
+            tokenizer.detector,
+            "classify",
+            wraps=tokenizer.detector.classify,
+        ) as classify:
+            self.assertEqual(tokenizer.tokenize(text + "and"), [text.strip() + " and"])
+
+        # Only the terminators in the trailing "docs.example.com now" are
+        # still waiting for right context; all earlier ones stay settled.
+        self.assertEqual(classify.call_count, 2)
+
+    def test_sentence_buffer_appends_and_consumes_prefix(self):
+        stream2sentence_module = importlib.import_module("stream2sentence.stream2sentence")
+        buffer = stream2sentence_module._SentenceBuffer()
+
+        for char in "  Hello. World":
+            buffer.append(char)
+
+        self.assertEqual(len(buffer), len("Hello. World"))
+        self.assertEqual(buffer.last, "d")
+        self.assertEqual(buffer.text, "Hello. World")
+        self.assertEqual(buffer.consume(6), "Hello.")
+        self.assertEqual(buffer.text, "World")
+        self.assertEqual(buffer.consume(), "World")
+        self.assertEqual((len(buffer), buffer.text, buffer.last), (0, "", ""))
+
+    def test_sentence_splitter_buffer_assignment_resets_buffer(self):
+        splitter = SentenceSplitter(minimum_sentence_length=1)
+        splitter.add("Partial")
+        list(splitter.stream())
+
+        splitter.buffer = " Replaced"
+        splitter.add("!")
+        list(splitter.stream())
+
+        self.assertEqual(splitter.buffer, "Replaced!")
+
+    def test_chunked_input_matches_character_input(self):
+        text = CONSENSUS_STRESS_INPUT + " Trailing words keep going without a stop"
+        configs = [
+            {},
+            {"quick_yield_single_sentence_fragment": True},
+            {"quick_yield_for_all_sentences": True},
+            {"quick_yield_every_fragment": True},
+            {"auto_context": True},
+            {"context_size": 4, "minimum_sentence_length": 3},
+        ]
+
+        for config in configs:
+            expected = list(generate_sentences(iter(text), **config))
+            for chunk_size in (3, 17, len(text)):
+                with self.subTest(config=config, chunk_size=chunk_size):
+                    self.assertEqual(
+                        list(generate_sentences(
+                            iter(chunk_text(text, chunk_size)), **config
+                        )),
+                        expected,
+                    )
+
     def test_quick_yield_does_not_split_parenthesized_values(self):
         cases = [
             "Option (3) is selected today.",
@@ -2242,6 +2805,43 @@ class TestSentenceGenerator(unittest.TestCase):
             cleanup_text_emojis=True,
         )
 
+    def test_remove_emojis_handles_sequences(self):
+        stream2sentence_module = importlib.import_module("stream2sentence.stream2sentence")
+        cases = [
+            ("Family \U0001F468‍\U0001F469‍\U0001F467 time.", "Family  time."),
+            ("Thumbs \U0001F44D\U0001F3FD up", "Thumbs  up"),
+            ("Press #️⃣ or 1, then \U0001F1FA\U0001F1F8!", "Press  or 1, then !"),
+            ("A lone \U0001F1FA stays", "A lone \U0001F1FA stays"),
+            ("Joined ☺️‍\U0001F44D.", "Joined ‍."),
+            ("Stray ️ selector and © sign", "Stray  selector and  sign"),
+            ("Café au lait", "Café au lait"),
+        ]
+        for text, expected in cases:
+            with self.subTest(text=text):
+                self.assertEqual(stream2sentence_module._remove_emojis(text), expected)
+
+    def test_emoji_table_matches_emoji_package(self):
+        try:
+            import emoji
+        except ModuleNotFoundError:
+            self.skipTest("the emoji package is not installed")
+        stream2sentence_module = importlib.import_module("stream2sentence.stream2sentence")
+        with open(
+            os.path.join(os.path.dirname(stream2sentence_module.__file__), "data", "emoji.json"),
+            encoding="utf-8",
+        ) as file:
+            version = json.load(file)["version"]
+        if version != emoji.__version__:
+            self.skipTest(f"the emoji table was built from emoji {version}")
+
+        for sequence in emoji.EMOJI_DATA:
+            text = f"a{sequence}b {sequence}{sequence}."
+            with self.subTest(sequence=sequence):
+                self.assertEqual(
+                    stream2sentence_module._remove_emojis(text),
+                    emoji.replace_emoji(text, ""),
+                )
+
     def test_check1(self):
         text = "I'll go with a glass of red wine. Thank you." 
         expected = ["I'll go with a glass of red wine.", "Thank you."]
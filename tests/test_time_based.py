@@ -1,6 +1,11 @@
 
-from stream2sentence.stream2sentence_time_based import generate_sentences_time_based as generate_sentences
-import time
+import asyncio
+import os
+import unittest
+from unittest import mock
+
+import stream2sentence.stream2sentence_time_based as time_based
+from stream2sentence.stream2sentence_time_based import replay_time_based
 
 input_stewart_wiki = '''
 In 1996 Mr. Stewart hosted a short-lived talk show entitled, Where's Elvis This Week?, which was a half-hour, weekly comedy television program. 
@@ -36,22 +41,20 @@ def print_word_targets(current_input, tps_target):
 
 
 def get_llm_output_simulation(current_input, tts):
-    def llm_output_simulation():
-        for word in get_words(current_input):
-            time.sleep(1 / (tts * WORDS_PER_TOKEN))
-            yield word
-    return llm_output_simulation()
+    # Each word arrives 1 / (tts * WORDS_PER_TOKEN) seconds after the previous one
+    return [
+        (word, (i + 1) / (tts * WORDS_PER_TOKEN))
+        for i, word in enumerate(get_words(current_input))
+    ]
 
 
 def run_test(input, simulated_tts, dynamic_offset=False):
   time_to_sentences = []
-  start_time = time.time()
-  for i, sentence in enumerate(
-    generate_sentences(
+  for i, (t, sentence) in enumerate(
+    replay_time_based(
         get_llm_output_simulation(input, simulated_tts),
         deadline_offsets_dynamic=[.5, .3, .1] if dynamic_offset else [0]
     )):
-        t = time.time() - start_time
         print(f"Sentence {i}: t={t:.1f} {sentence}")
         time_to_sentences.append([sentence, f"{t:.1f}"])
   print("\n\n RESULT ")
@@ -132,3 +135,346 @@ expected_result_4 = [
     ['proident, sunt in culpa qui officia deserunt mollit anim id est laborum.', '45.2']
 ]
 compare_results(result_4, expected_result_4)
+
+
+class VirtualTimeEventLoop(asyncio.SelectorEventLoop):
+    """An event loop whose clock jumps to the next timer instead of waiting for it."""
+
+    def __init__(self):
+        super().__init__()
+        self.now = 0.0
+        self._selector = _VirtualTimeSelector(self, self._selector)
+
+    def time(self):
+        return self.now
+
+
+class _VirtualTimeSelector:
+    def __init__(self, loop, selector):
+        self._loop = loop
+        self._selector = selector
+
+    def select(self, timeout=None):
+        if timeout:
+            self._loop.now += timeout
+        return self._selector.select(0)
+
+    def __getattr__(self, name):
+        return getattr(self._selector, name)
+
+
+class TestTimeBasedSplitting(unittest.TestCase):
+    def test_time_based_word_offsets_match_splitting_the_buffer(self):
+        tokens = ["Hel", "lo", " ", "there\n", "  my", " fri", "end.", "\t", " Yes", "", "a b", " "]
+        for cut in (None, 3, 9):
+            buffer = ""
+            offsets = time_based._WordOffsets()
+            for count, token in enumerate(tokens):
+                if not buffer or buffer[0].isspace():
+                    buffer = (buffer + token).lstrip()
+                    offsets.reset(buffer)
+                else:
+                    offsets.append(token, len(buffer))
+                    buffer += token
+                with self.subTest(cut=cut, buffer=buffer):
+                    self.assertEqual(offsets.has_two_words(), len(buffer.split(None, 2)) >= 2)
+                    self.assertEqual(offsets.without_last_word(buffer), buffer.rsplit(" ", 1)[0])
+                if count == cut:
+                    buffer = buffer[4:]
+                    offsets.reset(buffer)
+
+    def test_time_based_module_helpers_keep_their_signatures(self):
+        text = "Hi. I met Mr. Smith, at noon; he said yes. No"
+        with mock.patch.multiple(
+            time_based,
+            preferred_sentence_fragment_delimiters_global={". ", "? "},
+            sentence_fragment_delimiters_global={", ", "; "},
+            delimiter_ignore_prefixes_global={"Mr.", "Dr."},
+        ):
+            self.assertEqual(time_based.find_last_preferred_fragment_delimiter(text), text.index(". No"))
+            self.assertEqual(time_based.find_last_fragment_delimiter(text), text.index("; "))
+            # Only the last ". " is a candidate, and it follows an ignored prefix
+            self.assertEqual(time_based.find_last_delimiter("Hi. I met Mr. Smith", [". "]), -1)
+            self.assertEqual(time_based.find_last_delimiter("Hi. I met Mr. Smith", [". "], []), 12)
+            self.assertEqual(time_based.get_fragment(text, 3), "Hi. I met Mr. Smith, at noon; he said yes.")
+            self.assertEqual(time_based.get_fragment(text[:-8], 3), "Hi. I met Mr. Smith, at noon;")
+            self.assertEqual(time_based.get_fragment(text, 20), "")
+
+        output_sentences = ["One two.", "Three four five."]
+        self.assertTrue(time_based.is_output_needed(True, 10, 1, output_sentences, 0.5, 0, cur_time=12.6))
+        self.assertFalse(time_based.is_output_needed(True, 10, 1, output_sentences, 0.5, 0, cur_time=12.4))
+        self.assertFalse(time_based.is_output_needed(False, 10, 5, [], 0.5, 0, cur_time=12.6))
+        with mock.patch("time.time", return_value=12.6):
+            self.assertTrue(time_based.is_output_needed(True, 10, 1, output_sentences, 0.5, 0))
+
+        text = "One two.  Three four!  Five"
+        sentences = ["One two.", "Three four!", "Five"]
+        self.assertEqual(time_based.get_sentence_end_offset(text, sentences, 2), text.index("!") + 1)
+        self.assertIsNone(time_based.get_sentence_end_offset(text, ["Six."], 1))
+
+    def test_time_based_splitters_keep_their_settings_apart(self):
+        text = "Well, this works; it is fine. Mr. Smith agrees, mostly; Dr. Jones does not. The end"
+        tokens = [word + " " for word in text.split()]
+        # Output is always due, so the results do not depend on timing
+        common = {
+            "lead_time": 0,
+            "max_wait_for_fragments": [0],
+            "min_output_lengths": [1],
+            "deadline_offsets_static": [100],
+        }
+        settings = [
+            {"sentence_fragment_delimiters": [", "]},
+            {"sentence_fragment_delimiters": ["; "], "delimiter_ignore_prefixes": []},
+        ]
+        expected = [
+            list(time_based.generate_sentences_time_based(iter(tokens), **common, **options))
+            for options in settings
+        ]
+        self.assertNotEqual(expected[0], expected[1])
+
+        splitters = [
+            time_based.TimeBasedSentenceSplitter(**common, **options) for options in settings
+        ]
+        outputs = [[], []]
+        for token in tokens:
+            for splitter, output in zip(splitters, outputs):
+                splitter.add(token)
+                output.extend(splitter.stream())
+        for splitter, output in zip(splitters, outputs):
+            output.extend(splitter.flush())
+        self.assertEqual(outputs, expected)
+
+        async def async_tokens():
+            for token in tokens:
+                yield token
+                await asyncio.sleep(0)
+
+        async def collect(options):
+            return [
+                output
+                async for output in time_based.generate_sentences_time_based_async(
+                    async_tokens(), **common, **options
+                )
+            ]
+
+        async def collect_all():
+            return list(await asyncio.gather(*(collect(options) for options in settings)))
+
+        self.assertEqual(asyncio.run(collect_all()), expected)
+
+    def test_time_based_delimiter_scanner_matches_rfind_per_delimiter(self):
+        ignore_prefixes = {"Mr.", "Dr.", "e.g.,"}
+        text = "Hi. I met Mr. **Smith**, e.g., at noon; he said: * yes. Dr. No\n"
+        for delimiters in ([". ", "? ", "\n"], ["; ", ": ", ", ", "* ", "**"]):
+            scanner = time_based._DelimiterScanner(delimiters, ignore_prefixes)
+            for end in range(len(text) + 1):
+                with self.subTest(delimiters=delimiters, end=end):
+                    self.assertEqual(
+                        scanner.find_last(text[:end]),
+                        time_based.find_last_delimiter(text[:end], delimiters, ignore_prefixes),
+                    )
+
+    def test_time_based_deadlines_are_scheduled_while_tokens_stall(self):
+        async def stalling_tokens():
+            for token in ["one ", "two ", "three ", "four ", "five "]:
+                yield token
+            await asyncio.sleep(0.5)
+            for token in ["six. ", "Seven ", "eight."]:
+                yield token
+
+        async def collect(schedule_deadlines):
+            loop = asyncio.get_running_loop()
+            start = loop.time()
+            return [
+                (round(loop.time() - start, 6), output)
+                async for output in time_based.generate_sentences_time_based_async(
+                    stalling_tokens(),
+                    lead_time=0,
+                    max_wait_for_fragments=[0.05],
+                    min_output_lengths=[1],
+                    deadline_offsets_static=[100],
+                    schedule_deadlines=schedule_deadlines,
+                    clock=loop.time,
+                )
+            ]
+
+        async def collect_all():
+            return await collect(False), await asyncio.gather(collect(True), collect(True))
+
+        loop = VirtualTimeEventLoop()
+        try:
+            unscheduled, scheduled = loop.run_until_complete(collect_all())
+        finally:
+            loop.close()
+
+        self.assertEqual(unscheduled, [(0.5, "one two three four five six."), (0.5, "Seven eight.")])
+        for outputs in scheduled:
+            self.assertEqual(
+                outputs,
+                [(0.05, "one two three four five"), (0.5, "six."), (0.5, "Seven eight.")],
+            )
+
+    def test_time_based_output_is_due_at_next_deadline(self):
+        clock = time_based._VirtualClock()
+        splitter = time_based.TimeBasedSentenceSplitter(
+            lead_time=0,
+            max_wait_for_fragments=[0.5],
+            min_output_lengths=[1],
+            deadline_offsets_static=[0],
+            clock=clock,
+        )
+        splitter.add("one two three ")
+        self.assertEqual(list(splitter.stream()), [])
+        # Not due at the deadline itself, which is compared strictly
+        self.assertGreater(splitter.next_deadline, 0)
+        clock.now = splitter.next_deadline
+        self.assertEqual(list(splitter.poll()), [])
+        self.assertEqual(splitter.next_deadline, 0.5)
+        clock.now = splitter.next_deadline
+        self.assertEqual(list(splitter.poll()), ["one two three"])
+
+        async def tokens():
+            for token in ["one ", "two ", "three "]:
+                yield token
+
+        async def collect():
+            loop = asyncio.get_running_loop()
+            return [
+                (loop.time(), output)
+                async for output in time_based.generate_sentences_time_based_async(
+                    tokens(),
+                    lead_time=0,
+                    min_output_lengths=[1],
+                    deadline_offsets_static=[0],
+                    schedule_deadlines=True,
+                    clock=loop.time,
+                )
+            ]
+
+        loop = VirtualTimeEventLoop()
+        try:
+            outputs = loop.run_until_complete(asyncio.wait_for(collect(), 10))
+        finally:
+            loop.close()
+        self.assertEqual([output for _, output in outputs], ["one two three"])
+
+    def test_time_based_polled_outputs_do_not_start_with_whitespace(self):
+        records = [
+            ("three ", 0.01),
+            ("one ", 0.31),
+            ("nine? ", 0.41),
+            ("nine? ", 0.51),
+            ("six, ", 0.81),
+            ("four ", 0.82),
+            ("eight; ", 1.12),
+        ]
+        outputs = time_based.replay_time_based(
+            records,
+            schedule_deadlines=True,
+            lead_time=1,
+            deadline_offsets_static=[0.5],
+            min_output_lengths=[1],
+            target_tps=9,
+        )
+        self.assertEqual(
+            [output for _, output in outputs],
+            ["three one nine? nine?", "six,", "four eight;"],
+        )
+
+    def test_deadline_scheduler_runs_entries_added_by_callbacks_in_a_later_pass(self):
+        loop = VirtualTimeEventLoop()
+        try:
+            scheduler = time_based._DeadlineScheduler(loop)
+            runs = []
+
+            def reschedule():
+                runs.append(loop.time())
+                if len(runs) < 3:
+                    scheduler.schedule(loop.time(), reschedule)
+
+            with mock.patch.object(scheduler, "_run", wraps=scheduler._run) as run:
+                scheduler.schedule(1.0, reschedule)
+                loop.run_until_complete(asyncio.sleep(2))
+            self.assertEqual(runs, [1.0, 1.0, 1.0])
+            self.assertEqual(run.call_count, 3)
+        finally:
+            loop.close()
+
+    def test_time_based_deadline_errors_reach_the_consumer(self):
+        async def stalling_tokens():
+            yield "one two three "
+            await asyncio.sleep(10)
+            yield "four."
+
+        def on_yield(event):
+            raise RuntimeError(f"cannot speak {event.text!r}")
+
+        async def collect():
+            loop = asyncio.get_running_loop()
+            return [
+                output
+                async for output in time_based.generate_sentences_time_based_async(
+                    stalling_tokens(),
+                    lead_time=0,
+                    max_wait_for_fragments=[0.05],
+                    min_output_lengths=[1],
+                    deadline_offsets_static=[100],
+                    on_yield=on_yield,
+                    schedule_deadlines=True,
+                    clock=loop.time,
+                )
+            ]
+
+        loop = VirtualTimeEventLoop()
+        try:
+            with self.assertRaisesRegex(RuntimeError, "cannot speak 'one two three'"):
+                loop.run_until_complete(asyncio.wait_for(collect(), 5))
+        finally:
+            loop.close()
+
+    def test_time_based_replay_matches_generator_on_the_same_clock(self):
+        records = []
+        token = ""
+        path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "test_data", "1.txt")
+        with open(path, encoding="utf-8") as file:
+            for line in file:
+                if "!@#" in line:
+                    text, seconds = line.split("!@#", 1)
+                    records.append((token + text, float(seconds)))
+                    token = ""
+                else:
+                    token += line
+        options = {"lead_time": 0.3, "target_tps": 3.6, "deadline_offsets_dynamic": [0.1]}
+
+        now = 0.0
+
+        def clock():
+            return now
+
+        def tokens():
+            nonlocal now
+            for token, seconds in records:
+                now = seconds
+                yield token
+
+        events = []
+        outputs = []
+        for output in time_based.generate_sentences_time_based(
+            tokens(), clock=clock, on_yield=events.append, **options
+        ):
+            outputs.append((now, output))
+
+        self.assertGreater(len(outputs), 10)
+        self.assertEqual(time_based.replay_time_based(records, **options), outputs)
+        self.assertEqual([event.time for event in events], [seconds for seconds, _ in outputs])
+
+        scheduled = time_based.replay_time_based(records, schedule_deadlines=True, **options)
+        self.assertLessEqual(scheduled[0][0], outputs[0][0])
+        self.assertEqual(
+            "".join(output for _, output in scheduled).split(),
+            "".join(output for _, output in outputs).split(),
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,82 @@
+"""Precompile the emoji table used by emoji cleanup.
+
+Reads the emoji data of the installed `emoji` package and writes
+stream2sentence/data/emoji.json with:
+
+- ranges: the code points an emoji can start with, as regex class ranges
+- trie: every emoji sequence, one character per level. "" marks where a
+  sequence ends and is True if a zero width joiner right after it belongs
+  to the emoji too, like emoji.replace_emoji() treats it.
+- version: the emoji package version the table was built from
+
+Run it again after upgrading the emoji package.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+from pathlib import Path
+
+import emoji
+
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+DEFAULT_OUTPUT = REPO_ROOT / "stream2sentence" / "data" / "emoji.json"
+
+# emoji.replace_emoji() drops variation selectors that are not part of an emoji
+VARIATION_SELECTORS = "︎️"
+
+
+def build_trie(sequences) -> dict:
+    roots = {sequence[0] for sequence in sequences}
+    trie = {}
+    for sequence in sorted(sequences):
+        node = trie
+        for char in sequence:
+            node = node.setdefault(char, {})
+        # replace_emoji() only joins the next emoji if this one ends in a
+        # character that can start an emoji
+        node[""] = sequence[-1] in roots
+    for selector in VARIATION_SELECTORS:
+        trie.setdefault(selector, {}).setdefault("", False)
+    return trie
+
+
+def code_point_ranges(chars) -> str:
+    code_points = sorted(set(map(ord, chars)))
+    ranges = []
+    start = previous = code_points[0]
+    for code_point in code_points[1:] + [None]:
+        if code_point is not None and code_point == previous + 1:
+            previous = code_point
+            continue
+        ranges.append(f"\\U{start:08x}" if start == previous else f"\\U{start:08x}-\\U{previous:08x}")
+        if code_point is not None:
+            start = previous = code_point
+    return "".join(ranges)
+
+
+def build_table() -> dict:
+    trie = build_trie(emoji.EMOJI_DATA)
+    return {
+        "version": emoji.__version__,
+        "ranges": code_point_ranges(trie),
+        "trie": trie,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--output", type=Path, default=DEFAULT_OUTPUT)
+    args = parser.parse_args()
+
+    table = build_table()
+    with open(args.output, "w", encoding="utf-8") as file:
+        json.dump(table, file, ensure_ascii=False, separators=(",", ":"))
+        file.write("\n")
+    print(f"Wrote {len(emoji.EMOJI_DATA)} emoji from emoji {table['version']} to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""Precompile the per-language boundary detector data.
+
+Reads stream2sentence/data/language_contexts.json and writes one JSON file
+per language, plus the alias map, to stream2sentence/data/bundles. The
+detector loads only the small bundle of the language it is created for and
+builds its abbreviation trie from it, so a cold start does not parse the
+whole language_contexts.json or filter and sort the abbreviations again.
+
+Run it again after editing language_contexts.json or the English abbreviation
+lists in quick_yield_boundary.py; the test suite fails while the bundles are
+out of date.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(REPO_ROOT))
+
+from stream2sentence import quick_yield_boundary  # noqa: E402
+
+
+def write_bundle(directory: Path, name: str, bundle) -> None:
+    with open(directory / f"{name}.json", "w", encoding="utf-8") as file:
+        json.dump(bundle, file, ensure_ascii=False, separators=(",", ":"))
+        file.write("\n")
+
+
+def build_bundles(directory: Path) -> list[str]:
+    directory.mkdir(parents=True, exist_ok=True)
+    for stale in [*directory.glob("*.json"), *directory.glob("*.pickle")]:
+        stale.unlink()
+
+    write_bundle(directory, "aliases", quick_yield_boundary._build_language_aliases())
+    languages = list(quick_yield_boundary._load_language_contexts()["languages"])
+    for language in languages:
+        write_bundle(directory, language, quick_yield_boundary._build_language_bundle(language))
+    return languages
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--output",
+        type=Path,
+        default=Path(quick_yield_boundary._BUNDLE_DIRECTORY),
+        help="Directory to write the bundles to.",
+    )
+    args = parser.parse_args()
+
+    languages = build_bundles(args.output)
+    print(f"Wrote {len(languages)} language bundles to {args.output}")
+
+
+if __name__ == "__main__":
+    main()